@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import openai
+from summary import asummarize_incident_transcript
+from chunked_summary import asummarize_incident_transcript_chunked
+from metrics import get_registry
+
+# Defaults for headless batch runs
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RPM = 500
+DEFAULT_TPM = 200000
+DEFAULT_MAX_RETRIES = 6
+
+# Retries are made here, under the rate limiter, so the SDK must not retry on its own
+SDK_MAX_RETRIES = 0
+
+
+class RateLimiter:
+    """
+    Client-side token-bucket limiter for requests and tokens per minute.
+
+    Each request waits until both buckets hold enough capacity, so a batch
+    stays under the account limits instead of relying on 429 responses.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_RPM, tokens_per_minute=DEFAULT_TPM):
+        self.capacity = {"requests": float(requests_per_minute), "tokens": float(tokens_per_minute)}
+        self.available = dict(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        for name, capacity in self.capacity.items():
+            self.available[name] = min(capacity, self.available[name] + elapsed * capacity / 60.0)
+
+    async def acquire(self, tokens):
+        """Wait until one request costing ``tokens`` tokens may be sent."""
+        # A request larger than the whole bucket would otherwise wait forever
+        needed = {"requests": 1.0, "tokens": min(float(tokens), self.capacity["tokens"])}
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = max(
+                    (needed[name] - self.available[name]) * 60.0 / self.capacity[name]
+                    for name in needed
+                )
+                if wait <= 0:
+                    for name in needed:
+                        self.available[name] -= needed[name]
+                    return
+                await asyncio.sleep(wait)
+
+
+def is_retryable(error):
+    """Return True for rate-limit, server and connection errors."""
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Full-jitter exponential backoff delay for the given retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def read_transcripts(path):
+    """
+    Yield ``(id, transcript)`` pairs from a directory or a JSONL file.
+
+    A directory is read as one transcript per ``*.txt`` file, identified by
+    file name. A JSONL file must have ``id`` and ``transcript`` fields on
+    each line.
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".txt"):
+                with open(os.path.join(path, name), encoding="utf-8") as f:
+                    yield os.path.splitext(name)[0], f.read()
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield str(record["id"]), record["transcript"]
+
+
+def truncate_partial_line(path, block_size=65536):
+    """
+    Cut a partially written last line (from a crash) off the end of a JSONL file.
+
+    Without this, the next appended record would be glued onto the fragment
+    and both would be lost.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - block_size)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            position = start
+        else:
+            keep = 0
+        if keep != end:
+            f.truncate(keep)
+
+
+def read_completed(path):
+    """Return the ids already summarized successfully in an output JSONL file."""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from a crash
+                continue
+            if "summary" in record:
+                completed.add(record["id"])
+    return completed
+
+
+async def summarize_with_retry(transcript, api_key, limiter, max_retries=DEFAULT_MAX_RETRIES, chunked=False):
+    """
+    Summarize one transcript under the rate limiter, retrying transient errors.
+
+    Args:
+        transcript (str): The meeting transcript to summarize
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        limiter (RateLimiter): Shared rate limiter
+        max_retries (int): Retries after the first attempt for 429/5xx/connection errors
+        chunked (bool): Use map-reduce chunked summarization
+
+    Returns:
+        dict: The structured summary
+    """
+    attempt = 0
+    while True:
+        try:
+            # The limiter is charged per request actually sent (each window, when chunked), not for cache hits
+            if chunked:
+                return await asummarize_incident_transcript_chunked(
+                    transcript, api_key, limiter=limiter, max_retries=SDK_MAX_RETRIES
+                )
+            return await asummarize_incident_transcript(
+                transcript, api_key, max_retries=SDK_MAX_RETRIES, limiter=limiter
+            )
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            get_registry().record_retry()
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+
+
+async def run_batch(input_path, output_path, api_key=None, concurrency=DEFAULT_CONCURRENCY,
+                    requests_per_minute=DEFAULT_RPM, tokens_per_minute=DEFAULT_TPM,
+                    max_retries=DEFAULT_MAX_RETRIES, chunked=False, on_result=None):
+    """
+    Summarize every transcript in ``input_path`` and append results to ``output_path``.
+
+    Results are written as JSONL lines (``{"id", "summary"}`` or
+    ``{"id", "error"}``) as soon as each one finishes. The output file doubles
+    as the checkpoint: ids that already have a summary in it are skipped, so
+    an interrupted run can simply be restarted.
+
+    Args:
+        input_path (str): Directory of ``*.txt`` files or a JSONL file
+        output_path (str): Output JSONL file, appended to
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        concurrency (int): Maximum summaries in flight
+        requests_per_minute (int): Client-side request rate limit
+        tokens_per_minute (int): Client-side token rate limit
+        max_retries (int): Retries per transcript for transient errors
+        chunked (bool): Use map-reduce chunked summarization
+        on_result (callable, optional): Called as ``on_result(record, seconds)`` after each record is
+            written, with the seconds spent on that transcript including retries
+
+    Returns:
+        dict: Counts of "succeeded", "failed" and "skipped" transcripts
+    """
+    truncate_partial_line(output_path)
+    completed = read_completed(output_path)
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    counts = {"succeeded": 0, "failed": 0, "skipped": 0}
+    # A small bounded queue keeps memory flat regardless of archive size
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        def write(record):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                transcript_id, transcript = item
+                start = time.perf_counter()
+                try:
+                    summary = await summarize_with_retry(transcript, api_key, limiter, max_retries, chunked)
+                    record = {"id": transcript_id, "summary": summary}
+                    counts["succeeded"] += 1
+                except Exception as e:
+                    record = {"id": transcript_id, "error": str(e)}
+                    counts["failed"] += 1
+                write(record)
+                if on_result is not None:
+                    on_result(record, time.perf_counter() - start)
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        for transcript_id, transcript in read_transcripts(input_path):
+            if transcript_id in completed:
+                counts["skipped"] += 1
+                continue
+            await queue.put((transcript_id, transcript))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize stored incident transcripts to JSONL.")
+    parser.add_argument("input", help="Directory of .txt transcripts or a JSONL file with id/transcript fields")
+    parser.add_argument("output", help="Output JSONL file (also used as the resume checkpoint)")
+    parser.add_argument("--api-key", help="OpenAI API key (defaults to OPENAI_API_KEY)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM, help="Requests per minute limit")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TPM, help="Tokens per minute limit")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES)
+    parser.add_argument("--chunked", action="store_true", help="Use chunked map-reduce summarization")
+    args = parser.parse_args(argv)
+
+    counts = asyncio.run(run_batch(
+        args.input, args.output, args.api_key, args.concurrency,
+        args.rpm, args.tpm, args.max_retries, args.chunked,
+    ))
+    print(json.dumps(counts))
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+import urllib.request
+from example_data import EXAMPLE_TRANSCRIPT
+from summary import summarize_incident_transcript, asummarize_incident_transcript, stream_incident_summary
+from chunked_summary import summarize_incident_transcript_chunked
+from batch import run_batch
+from tokens import count_tokens
+
+SCENARIOS = ["sync", "async", "chunked", "stream", "batch"]
+DEFAULT_SIZES = [1, 2, 4, 8]
+
+
+def build_transcript(size, run_id):
+    """
+    Build a synthetic transcript of ``size`` times the example transcript.
+
+    A unique header keeps every run distinct; the summary cache is also
+    disabled by default because chunked runs share identical later windows.
+    """
+    return f"Benchmark run {run_id}. " + " ".join([EXAMPLE_TRANSCRIPT] * size)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class MockServerProcess:
+    """Run ``mock_responses_server.py`` in a child process so it does not skew memory measurements."""
+
+    def __init__(self, latency, output_tps, error_rate):
+        self.args = [
+            sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_responses_server.py"),
+            "--port", "0", "--latency", str(latency), "--output-tps", str(output_tps),
+            "--error-rate", str(error_rate),
+        ]
+        self.process = None
+        self.base_url = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(self.args, stdout=subprocess.PIPE, text=True)
+        line = self.process.stdout.readline()
+        self.base_url = line.strip().rsplit(" ", 1)[-1]
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait()
+
+    def _call(self, method):
+        root = self.base_url.rsplit("/v1", 1)[0]
+        request = urllib.request.Request(root + "/stats", method=method)
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def stats(self):
+        return self._call("GET")
+
+    def reset_stats(self):
+        self._call("DELETE")
+
+
+def _run_sync(transcripts, concurrency):
+    latencies = []
+    for transcript in transcripts:
+        start = time.perf_counter()
+        summarize_incident_transcript(transcript)
+        latencies.append(time.perf_counter() - start)
+    return latencies, {}
+
+
+def _run_chunked(transcripts, concurrency):
+    latencies = []
+    for transcript in transcripts:
+        start = time.perf_counter()
+        summarize_incident_transcript_chunked(transcript, max_concurrency=concurrency)
+        latencies.append(time.perf_counter() - start)
+    return latencies, {}
+
+
+def _run_stream(transcripts, concurrency):
+    latencies = []
+    first_step = []
+    for transcript in transcripts:
+        start = time.perf_counter()
+        seen_step = False
+        for event, _ in stream_incident_summary(transcript):
+            if event == "step" and not seen_step:
+                first_step.append(time.perf_counter() - start)
+                seen_step = True
+        latencies.append(time.perf_counter() - start)
+    return latencies, {
+        "time_to_first_step_p50": percentile(first_step, 50),
+        "time_to_first_step_p95": percentile(first_step, 95),
+    }
+
+
+def _run_async(transcripts, concurrency):
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def one(transcript):
+            async with semaphore:
+                start = time.perf_counter()
+                await asummarize_incident_transcript(transcript)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(t) for t in transcripts))
+        return latencies
+
+    return asyncio.run(run()), {}
+
+
+def _run_batch(transcripts, concurrency):
+    latencies = []
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "input.jsonl")
+        output_path = os.path.join(tmp, "output.jsonl")
+        with open(input_path, "w", encoding="utf-8") as f:
+            for i, transcript in enumerate(transcripts):
+                f.write(json.dumps({"id": i, "transcript": transcript}) + "\n")
+        counts = asyncio.run(run_batch(
+            input_path, output_path, concurrency=concurrency,
+            requests_per_minute=10 ** 6, tokens_per_minute=10 ** 9,
+            on_result=lambda record, seconds: latencies.append(seconds),
+        ))
+    return latencies, {"batch_failed": counts["failed"]}
+
+
+RUNNERS = {
+    "sync": _run_sync,
+    "async": _run_async,
+    "chunked": _run_chunked,
+    "stream": _run_stream,
+    "batch": _run_batch,
+}
+
+
+def measure_peak_memory(name, transcripts, concurrency):
+    """
+    Rerun a scenario under tracemalloc and return its peak traced memory in bytes.
+
+    Tracing slows every allocation down, so it runs as a separate pass and
+    never overlaps the timed run.
+    """
+    tracemalloc.start()
+    try:
+        RUNNERS[name](transcripts, concurrency)
+    except Exception:
+        pass
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak
+
+
+def run_scenario(name, size, iterations, concurrency, server, memory=True):
+    """Run one scenario at one transcript size and return its result record."""
+    run_id = f"{name}-{size}-{time.time_ns()}"
+    transcripts = [build_transcript(size, f"{run_id}-{i}") for i in range(iterations)]
+
+    server.reset_stats()
+    start = time.perf_counter()
+    errors = 0
+    try:
+        latencies, extra = RUNNERS[name](transcripts, concurrency)
+    except Exception as e:
+        latencies, extra = [], {"error": str(e)}
+        errors = 1
+    elapsed = time.perf_counter() - start
+    stats = server.stats()
+
+    peak = None
+    if memory:
+        # Fresh transcripts so the memory pass never hits anything the timed pass produced
+        peak = measure_peak_memory(
+            name, [build_transcript(size, f"{run_id}-mem-{i}") for i in range(iterations)], concurrency
+        )
+
+    return {
+        "scenario": name,
+        "size": size,
+        "transcript_tokens": count_tokens(transcripts[0]),
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_time": elapsed,
+        "throughput": iterations / elapsed if elapsed else None,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+        "requests": stats["requests"],
+        "injected_errors": stats["errors"],
+        "input_tokens_per_summary": stats["input_tokens"] / iterations,
+        "output_tokens_per_summary": stats["output_tokens"] / iterations,
+        "peak_memory_bytes": peak,
+        **extra,
+    }
+
+
+def compare(results, baseline):
+    """Print p50/p95 latency and throughput ratios against a baseline results file."""
+    previous = {(r["scenario"], r["size"]): r for r in baseline["results"]}
+    print(f"{'scenario':<10}{'size':>6}{'p50':>10}{'p95':>10}{'thrpt':>10}")
+    for record in results:
+        base = previous.get((record["scenario"], record["size"]))
+        if base is None:
+            continue
+
+        def ratio(key):
+            if not record.get(key) or not base.get(key):
+                return "-"
+            return f"{record[key] / base[key]:.2f}x"
+
+        print(f"{record['scenario']:<10}{record['size']:>6}{ratio('latency_p50'):>10}"
+              f"{ratio('latency_p95'):>10}{ratio('throughput'):>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark summarization against a local mock Responses server.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+                        help="Transcript sizes as multiples of the example transcript")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock seconds before the first output token")
+    parser.add_argument("--output-tps", type=float, default=500.0, help="Mock output tokens per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock fraction of 429/500 responses")
+    parser.add_argument("--compact", action="store_true", help="Enable transcript compaction")
+    parser.add_argument("--cache", action="store_true", help="Leave the summary cache enabled")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the separate peak-memory pass")
+    parser.add_argument("--output", default="bench_results.json", help="Where to save the results JSON")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            MockServerProcess(args.latency, args.output_tps, args.error_rate) as server:
+        # Point the SDK at the mock server and keep the summary cache out of the way
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ["OPENAI_API_KEY"] = "sk-benchmark"
+        os.environ["SUMMARY_CACHE_PATH"] = os.path.join(cache_dir, "cache.sqlite3")
+        os.environ["SUMMARY_COMPACT"] = "1" if args.compact else "0"
+        os.environ["SUMMARY_CACHE"] = "1" if args.cache else "0"
+
+        results = []
+        for name in args.scenarios:
+            for size in args.sizes:
+                record = run_scenario(name, size, args.iterations, args.concurrency, server, not args.no_memory)
+                results.append(record)
+                p50 = "-" if record["latency_p50"] is None else f"{record['latency_p50']:.3f}s"
+                peak = "-" if record["peak_memory_bytes"] is None else f"{record['peak_memory_bytes'] / 1e6:.1f}MB"
+                print(f"{name:<10} size={size:<3} p50={p50} "
+                      f"throughput={record['throughput']:.2f}/s "
+                      f"in={record['input_tokens_per_summary']:.0f} out={record['output_tokens_per_summary']:.0f} "
+                      f"peak={peak}", flush=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from summary import summarize_incident_transcript, asummarize_incident_transcript, MAX_OUTPUT_TOKENS
+from tokens import count_tokens
+from compaction import split_utterances, join_utterances
+
+# Summary tokens produced per transcript token; about 0.23 on the example transcript, rounded up for headroom
+EXPECTED_OUTPUT_RATIO = 0.3
+
+# Window size and overlap (in tokens) for chunked summarization. A window's summary must fit
+# in MAX_OUTPUT_TOKENS, or the JSON is cut off; smaller transcripts stay a single request.
+CHUNK_TOKENS = int(MAX_OUTPUT_TOKENS / EXPECTED_OUTPUT_RATIO)
+OVERLAP_TOKENS = 200
+
+# Number of chunk summaries requested concurrently
+MAX_CONCURRENCY = 4
+
+# Steps whose word overlap with an already kept step exceeds this are dropped as duplicates
+DUPLICATE_THRESHOLD = 0.6
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def chunk_transcript(transcript, chunk_tokens=CHUNK_TOKENS, overlap_tokens=OVERLAP_TOKENS):
+    """
+    Split a transcript into token-bounded, overlapping windows.
+
+    Windows always break between utterances. Each window after the first
+    starts with the trailing utterances of the previous one (up to
+    ``overlap_tokens``) so a discussion that spans a boundary is seen whole
+    by at least one window.
+
+    Args:
+        transcript (str): The meeting transcript
+        chunk_tokens (int): Maximum tokens per window
+        overlap_tokens (int): Tokens repeated from the end of the previous window
+
+    Returns:
+        list[str]: The transcript windows, in order
+    """
+    utterances = split_utterances(transcript, keep_breaks=True)
+    sizes = [count_tokens(u) for u, _ in utterances]
+
+    chunks = []
+    start = 0
+    while start < len(utterances):
+        # Always take at least one utterance, even if it exceeds the budget on its own
+        end = start + 1
+        total = sizes[start]
+        while end < len(utterances) and total + sizes[end] <= chunk_tokens:
+            total += sizes[end]
+            end += 1
+        chunks.append(join_utterances(utterances[start:end]))
+        if end == len(utterances):
+            break
+
+        # Step back over the trailing utterances that fit in the overlap
+        next_start = end
+        overlap = 0
+        while next_start - 1 > start and overlap + sizes[next_start - 1] <= overlap_tokens:
+            next_start -= 1
+            overlap += sizes[next_start]
+        start = next_start
+    return chunks
+
+
+def _step_words(step):
+    """Return the set of lowercase words in a step's title and description."""
+    text = f"{step.get('discussion_step', '')} {step.get('description', '')}"
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def _similarity(a, b):
+    """Jaccard similarity of two word sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def merge_summaries(partials, threshold=DUPLICATE_THRESHOLD):
+    """
+    Merge per-window summaries into one ordered summary.
+
+    Steps are concatenated in window order. Because windows overlap, a step
+    near a boundary is often reported twice; a step is dropped when it closely
+    matches one of the steps kept from the previous window.
+
+    Args:
+        partials (list[dict]): Window summaries, in transcript order
+        threshold (float): Word-overlap similarity above which a step is a duplicate
+
+    Returns:
+        dict: The merged summary with "steps" and "currently_discussed"
+    """
+    steps = []
+    previous_window = []
+    for partial in partials:
+        current_window = []
+        for step in partial.get('steps', []):
+            words = _step_words(step)
+            if any(_similarity(words, seen) >= threshold for seen in previous_window):
+                continue
+            if steps and steps[-1].get('discussion_step', '').lower() == step.get('discussion_step', '').lower():
+                continue
+            steps.append(step)
+            current_window.append(words)
+        previous_window = current_window or previous_window
+
+    # The most recent window describes what the call is focused on now
+    last = partials[-1] if partials else {}
+    return {
+        'steps': steps,
+        'currently_discussed': last.get('currently_discussed', last.get('current_discussion', '')),
+    }
+
+
+def summarize_incident_transcript_chunked(transcript, api_key=None, chunk_tokens=CHUNK_TOKENS,
+                                          overlap_tokens=OVERLAP_TOKENS, max_concurrency=MAX_CONCURRENCY):
+    """
+    Summarize a long transcript by summarizing overlapping windows in parallel.
+
+    Wall-clock time grows with the number of windows divided by
+    ``max_concurrency`` rather than with the length of the whole transcript,
+    and no single request exceeds the window size.
+
+    Args:
+        transcript (str): The meeting transcript to summarize
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        chunk_tokens (int): Maximum tokens per window
+        overlap_tokens (int): Tokens repeated between consecutive windows
+        max_concurrency (int): Maximum number of window summaries in flight
+
+    Returns:
+        dict: The merged summary
+    """
+    chunks = chunk_transcript(transcript, chunk_tokens, overlap_tokens)
+    if len(chunks) <= 1:
+        return summarize_incident_transcript(transcript, api_key)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        partials = list(executor.map(lambda chunk: summarize_incident_transcript(chunk, api_key), chunks))
+    return merge_summaries(partials)
+
+
+async def asummarize_incident_transcript_chunked(transcript, api_key=None, chunk_tokens=CHUNK_TOKENS,
+                                                 overlap_tokens=OVERLAP_TOKENS, max_concurrency=MAX_CONCURRENCY,
+                                                 limiter=None, max_retries=None):
+    """
+    Async counterpart of ``summarize_incident_transcript_chunked``.
+
+    Args:
+        transcript (str): The meeting transcript to summarize
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        chunk_tokens (int): Maximum tokens per window
+        overlap_tokens (int): Tokens repeated between consecutive windows
+        max_concurrency (int): Maximum number of window summaries in flight
+        limiter (batch.RateLimiter, optional): Rate limiter charged once per window request sent
+        max_retries (int, optional): Retries the SDK makes on its own; defaults to the SDK's setting
+
+    Returns:
+        dict: The merged summary
+    """
+    async def summarize_window(window):
+        return await asummarize_incident_transcript(window, api_key, max_retries=max_retries, limiter=limiter)
+
+    chunks = chunk_transcript(transcript, chunk_tokens, overlap_tokens)
+    if len(chunks) <= 1:
+        return await summarize_window(transcript)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def summarize_chunk(chunk):
+        async with semaphore:
+            return await summarize_window(chunk)
+
+    partials = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+    return merge_summaries(partials)
@@ -0,0 +1,158 @@
+import re
+from collections import deque
+from dataclasses import dataclass
+from tokens import count_tokens
+
+# Utterances end at line breaks, or at sentence punctuation followed by whitespace, so
+# decimals, versions, IP addresses and host names such as "db2.kafka.internal" stay whole
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+")
+
+# Disfluencies removed from inside utterances
+_FILLER_WORDS_RE = re.compile(r"\b(?:um+|uh+|erm+|er|ah+|hmm+|mhm)\b[,.]?\s*", re.IGNORECASE)
+
+# Utterances that carry no content on their own
+FILLER_UTTERANCES = frozenset({
+    "okay", "ok", "alright", "all right", "got it", "thanks", "thank you", "great", "cool",
+    "yep", "yup", "mhm", "sounds good", "perfect", "nice",
+})
+
+# Word n-gram size used for near-duplicate detection
+SHINGLE_SIZE = 3
+
+# Number of preceding kept utterances an utterance is compared against
+DUPLICATE_WINDOW = 4
+
+# Shingle containment above which an utterance is considered a repeat
+DUPLICATE_THRESHOLD = 0.8
+
+# Utterances with fewer words are never treated as duplicates ("Agent 03." carries a fact)
+MIN_DUPLICATE_WORDS = 3
+
+# Utterances with fewer shingles only repeat one of about their own length, so a short
+# answer such as "I don't know." is not dropped for appearing inside a longer sentence
+MIN_DUPLICATE_SHINGLES = SHINGLE_SIZE + 1
+
+
+@dataclass
+class CompactionResult:
+    """Compacted transcript text and what the compaction removed."""
+
+    text: str
+    tokens_before: int
+    tokens_after: int
+    duplicates_removed: int = 0
+    fillers_removed: int = 0
+
+    @property
+    def savings(self):
+        """Fraction of input tokens removed."""
+        if not self.tokens_before:
+            return 0.0
+        return 1 - self.tokens_after / self.tokens_before
+
+
+def split_utterances(transcript, keep_breaks=False):
+    """
+    Split a transcript into utterances on sentence and line boundaries.
+
+    Args:
+        transcript (str): The meeting transcript
+        keep_breaks (bool): Return ``(utterance, ends_line)`` pairs so line
+            breaks can be restored with ``join_utterances``
+
+    Returns:
+        list: The utterances, in order
+    """
+    utterances = []
+    for line in transcript.splitlines():
+        parts = [part for part in _SENTENCE_END_RE.split(line.strip()) if part]
+        for i, part in enumerate(parts):
+            utterances.append((part, i == len(parts) - 1) if keep_breaks else part)
+    return utterances
+
+
+def join_utterances(utterances):
+    """Join ``(utterance, ends_line)`` pairs, keeping one turn per line where the input had it."""
+    parts = []
+    for i, (utterance, ends_line) in enumerate(utterances):
+        if i:
+            parts.append("\n" if utterances[i - 1][1] else " ")
+        parts.append(utterance)
+    return "".join(parts)
+
+
+def _shingles(words):
+    """Return the hashed word n-grams of an utterance."""
+    if len(words) < SHINGLE_SIZE:
+        return {hash(tuple(words))}
+    return {hash(tuple(words[i:i + SHINGLE_SIZE])) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def _is_repeat(shingles, seen):
+    """Return True if an utterance's shingles are mostly contained in an earlier one's."""
+    # Containment of the candidate's own shingles, so a repeat with a word added or missing
+    # still matches but a longer utterance is never dropped for a shorter one
+    if len(shingles & seen) / len(shingles) < DUPLICATE_THRESHOLD:
+        return False
+    return len(shingles) >= MIN_DUPLICATE_SHINGLES or len(seen) <= len(shingles) + 1
+
+
+def compact_transcript(transcript, dedupe=True, drop_filler=True):
+    """
+    Shrink a transcript before it is sent for summarization.
+
+    Whitespace is normalized, filler words and filler-only utterances are
+    dropped, and an utterance is removed when its own word shingles are
+    mostly contained in one of the last few kept utterances (ASR output often
+    repeats sentences verbatim). Very short fragments are never removed as
+    repeats, short utterances are only removed as repeats of one about as
+    short, and line breaks between turns are preserved. Each utterance is
+    compared against a fixed-size window, so the whole pass is linear in the
+    transcript length.
+
+    Args:
+        transcript (str): The meeting transcript
+        dedupe (bool): Remove near-duplicate nearby utterances
+        drop_filler (bool): Remove filler words and filler-only utterances
+
+    Returns:
+        CompactionResult: The compacted text with token counts before and after
+    """
+    tokens_before = count_tokens(transcript)
+    recent = deque(maxlen=DUPLICATE_WINDOW)
+    kept = []
+    duplicates = fillers = 0
+
+    for utterance, ends_line in split_utterances(transcript, keep_breaks=True):
+        utterance = _WHITESPACE_RE.sub(" ", utterance)
+        if drop_filler:
+            utterance = _FILLER_WORDS_RE.sub("", utterance).strip()
+            words = _WORD_RE.findall(utterance.lower())
+            if not words or " ".join(words) in FILLER_UTTERANCES:
+                fillers += 1
+                if ends_line and kept:
+                    kept[-1] = (kept[-1][0], True)
+                continue
+        else:
+            words = _WORD_RE.findall(utterance.lower())
+
+        if dedupe and len(words) >= MIN_DUPLICATE_WORDS:
+            shingles = _shingles(words)
+            if any(_is_repeat(shingles, seen) for seen in recent):
+                duplicates += 1
+                if ends_line and kept:
+                    kept[-1] = (kept[-1][0], True)
+                continue
+            recent.append(shingles)
+        kept.append((utterance, ends_line))
+
+    text = join_utterances(kept)
+    return CompactionResult(
+        text=text,
+        tokens_before=tokens_before,
+        tokens_after=count_tokens(text),
+        duplicates_removed=duplicates,
+        fillers_removed=fillers,
+    )
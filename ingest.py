@@ -0,0 +1,307 @@
+import os
+import sys
+import abc
+import argparse
+import threading
+import numpy as np
+import ffmpeg
+from session_service import SessionClient, DEFAULT_PORT
+
+# Audio format decoded from recordings: 16 kHz mono signed 16-bit PCM
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+
+# Energy VAD settings
+VAD_THRESHOLD_DB = 12.0     # speech must be this far above the tracked noise floor
+VAD_MIN_ENERGY_DB = -50.0   # absolute floor so digital silence is never speech
+VAD_NOISE_FLOOR_DB = -60.0  # initial noise floor estimate and the lowest it is tracked down to
+VAD_NOISE_RISE_DB = 4.0     # dB per second the floor drifts up while frames are above it
+VAD_HANGOVER_MS = 300       # trailing silence kept before a segment is closed
+VAD_PREROLL_MS = 150        # leading audio kept before speech onset
+MIN_SEGMENT_MS = 250
+MAX_SEGMENT_MS = 15000
+
+
+def open_decoder(source, sample_rate=SAMPLE_RATE, follow=False):
+    """
+    Start an ffmpeg process decoding ``source`` to raw PCM on stdout.
+
+    Args:
+        source (str): Path or URL of a recording ffmpeg can read
+        sample_rate (int): Output sample rate
+        follow (bool): Keep reading a file that is still being written by a recorder
+
+    Returns:
+        subprocess.Popen: The running ffmpeg process
+    """
+    # -follow only applies to the file protocol; it makes ffmpeg wait for more data at EOF
+    input_args = {"follow": 1} if follow else {}
+    return (
+        ffmpeg
+        .input(source, **input_args)
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=sample_rate)
+        .global_args("-loglevel", "error", "-nostdin")
+        .run_async(pipe_stdout=True)
+    )
+
+
+def read_frames(stream, frame_samples):
+    """
+    Yield fixed-size int16 frames read from a raw PCM byte stream.
+
+    The same preallocated buffer is reused for every frame, so callers must
+    copy a frame if they need it after the next iteration. A trailing partial
+    frame is zero-padded.
+
+    Args:
+        stream: Binary file object supporting ``readinto``
+        frame_samples (int): Samples per frame
+
+    Yields:
+        numpy.ndarray: The frame buffer
+    """
+    frame = np.empty(frame_samples, dtype=np.int16)
+    view = memoryview(frame).cast("B")
+    while True:
+        filled = 0
+        while filled < len(view):
+            count = stream.readinto(view[filled:])
+            if not count:
+                break
+            filled += count
+        if filled == 0:
+            return
+        if filled < len(view):
+            frame[filled // 2:] = 0
+            yield frame
+            return
+        yield frame
+
+
+class EnergyVAD:
+    """
+    Energy-based voice activity detector producing speech segments.
+
+    Frame energy is compared against a minimum-tracking noise floor: it drops
+    at once to any quieter frame and only drifts up slowly, so a recording
+    that starts mid-speech is not mistaken for its own background. Speech frames
+    are copied into a preallocated segment buffer (together with a short
+    pre-roll); a segment is emitted after ``hangover`` of silence or when it
+    reaches the maximum length, so memory use does not depend on how long
+    the recording is.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, threshold_db=VAD_THRESHOLD_DB,
+                 hangover_ms=VAD_HANGOVER_MS, preroll_ms=VAD_PREROLL_MS,
+                 min_segment_ms=MIN_SEGMENT_MS, max_segment_ms=MAX_SEGMENT_MS):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.threshold_db = threshold_db
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.preroll_frames = preroll_ms // frame_ms
+        self.min_segment_samples = sample_rate * min_segment_ms // 1000
+        self.max_frames = max(1, max_segment_ms // frame_ms)
+
+        self.noise_db = VAD_NOISE_FLOOR_DB
+        self.noise_rise_per_frame = VAD_NOISE_RISE_DB * frame_ms / 1000
+        self.segment = np.zeros(self.max_frames * self.frame_samples, dtype=np.int16)
+        self.preroll = np.zeros((max(self.preroll_frames, 1), self.frame_samples), dtype=np.int16)
+        self.preroll_count = 0
+        self.segment_frames = 0
+        self.silent_frames = 0
+        self.samples_seen = 0
+        self.segment_start = 0
+
+    def _energy_db(self, frame):
+        rms = np.sqrt(np.mean(np.square(frame, dtype=np.float64))) / 32768.0
+        return 20.0 * np.log10(rms + 1e-10)
+
+    def _track_noise(self, energy, is_speech):
+        if energy < self.noise_db:
+            self.noise_db = max(energy, VAD_NOISE_FLOOR_DB)
+        elif is_speech:
+            # Lets an estimate that started too low (or a noise level that went up) recover
+            self.noise_db += self.noise_rise_per_frame
+        else:
+            self.noise_db = 0.95 * self.noise_db + 0.05 * energy
+
+    def _append(self, frame):
+        start = self.segment_frames * self.frame_samples
+        self.segment[start:start + self.frame_samples] = frame
+        self.segment_frames += 1
+
+    def _emit(self):
+        """Close the current segment and return ``(start_seconds, samples)`` or None if too short."""
+        # Drop the trailing silence kept by the hangover
+        frames = self.segment_frames - self.silent_frames
+        self.segment_frames = 0
+        self.silent_frames = 0
+        length = frames * self.frame_samples
+        if length < self.min_segment_samples:
+            return None
+        return self.segment_start / self.sample_rate, self.segment[:length]
+
+    def process(self, frame):
+        """
+        Feed one frame.
+
+        Returns:
+            tuple or None: ``(start_seconds, samples)`` when a segment closes.
+            ``samples`` is a view of the internal buffer and is only valid
+            until the next call.
+        """
+        energy = self._energy_db(frame)
+        is_speech = energy > max(self.noise_db + self.threshold_db, VAD_MIN_ENERGY_DB)
+        self._track_noise(energy, is_speech)
+        frame_start = self.samples_seen
+        self.samples_seen += len(frame)
+
+        if self.segment_frames == 0:
+            if not is_speech:
+                # Keep a short pre-roll
+                if self.preroll_frames:
+                    self.preroll[self.preroll_count % self.preroll_frames] = frame
+                    self.preroll_count += 1
+                return None
+
+            # Speech onset: start the segment with the buffered pre-roll, oldest first
+            kept = min(self.preroll_count, self.preroll_frames)
+            for i in range(self.preroll_count - kept, self.preroll_count):
+                self._append(self.preroll[i % self.preroll_frames])
+            self.segment_start = frame_start - kept * self.frame_samples
+            self.preroll_count = 0
+
+        self._append(frame)
+        self.silent_frames = 0 if is_speech else self.silent_frames + 1
+
+        if self.silent_frames >= self.hangover_frames or self.segment_frames >= self.max_frames:
+            return self._emit()
+        return None
+
+    def flush(self):
+        """Close any open segment at the end of the stream."""
+        if self.segment_frames == 0:
+            return None
+        return self._emit()
+
+
+class Transcriber(abc.ABC):
+    """Interface for turning a speech segment into text."""
+
+    @abc.abstractmethod
+    def transcribe(self, samples, sample_rate):
+        """
+        Transcribe one speech segment.
+
+        Args:
+            samples (numpy.ndarray): Mono int16 PCM; only valid for the duration of the call
+            sample_rate (int): Sample rate of ``samples``
+
+        Returns:
+            str: The recognized text (may be empty)
+        """
+
+
+class StubTranscriber(Transcriber):
+    """Local placeholder transcriber that describes each segment instead of recognizing it."""
+
+    def transcribe(self, samples, sample_rate):
+        return f"[speech {len(samples) / sample_rate:.1f}s]"
+
+
+class LiveTranscript:
+    """Thread-safe transcript that grows as segments are transcribed."""
+
+    def __init__(self):
+        self._parts = []
+        self._lock = threading.Lock()
+
+    def append(self, text):
+        text = text.strip()
+        if text:
+            with self._lock:
+                self._parts.append(text)
+
+    @property
+    def text(self):
+        with self._lock:
+            return " ".join(self._parts)
+
+
+def ingest(source, transcriber, transcript=None, follow=False, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS,
+           on_segment=None):
+    """
+    Decode a recording, segment it with the VAD and transcribe each segment.
+
+    Audio is piped from ffmpeg straight into fixed-size frame buffers; no
+    intermediate WAV file is written and memory stays bounded by the maximum
+    segment length regardless of recording length.
+
+    Args:
+        source (str): Path or URL of the recording
+        transcriber (Transcriber): Speech-to-text implementation
+        transcript (LiveTranscript, optional): Transcript to append to; created if not given
+        follow (bool): Keep reading a recording that is still being written
+        sample_rate (int): Decoding sample rate
+        frame_ms (int): Frame length in milliseconds
+        on_segment (callable, optional): Called with ``(start_seconds, text)`` after each segment
+
+    Returns:
+        LiveTranscript: The transcript
+    """
+    transcript = transcript if transcript is not None else LiveTranscript()
+    vad = EnergyVAD(sample_rate, frame_ms)
+
+    def handle(segment):
+        if segment is None:
+            return
+        start, samples = segment
+        text = transcriber.transcribe(samples, sample_rate)
+        transcript.append(text)
+        if on_segment is not None:
+            on_segment(start, text)
+
+    process = open_decoder(source, sample_rate, follow)
+    try:
+        for frame in read_frames(process.stdout, vad.frame_samples):
+            handle(vad.process(frame))
+        handle(vad.flush())
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.terminate()
+        process.wait()
+    return transcript
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe a recording into an incident transcript.")
+    parser.add_argument("source", help="Recording path or URL")
+    parser.add_argument("--follow", action="store_true", help="Keep reading a recording that is still being written")
+    parser.add_argument("--session", help="Append each segment to this live session on the session service")
+    parser.add_argument("--service-url",
+                        default=os.environ.get("SESSION_SERVICE_URL", f"http://127.0.0.1:{DEFAULT_PORT}"),
+                        help="Session service URL (defaults to SESSION_SERVICE_URL)")
+    args = parser.parse_args(argv)
+    client = SessionClient(args.service_url) if args.session else None
+
+    def on_segment(start, text):
+        minutes, seconds = divmod(int(start), 60)
+        print(f"[{minutes:02d}:{seconds:02d}] {text}", flush=True)
+        if client is None or not text.strip():
+            return
+        # A service outage loses this segment from the live summary but must not stop ingestion
+        try:
+            client.append(args.session, text)
+        except OSError as e:
+            print(f"Could not append to session {args.session}: {e}", file=sys.stderr, flush=True)
+
+    try:
+        ingest(args.source, StubTranscriber(), follow=args.follow, on_segment=on_segment)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+import os
+import time
+import atexit
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# USD per million tokens: (input, cached input, output)
+PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+
+# Histogram bucket upper bounds (seconds) for the per-phase latency metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+PHASES = ("client_setup", "request", "parse", "total")
+
+# Minimum seconds between rewrites of the exposition file; calls in between are batched
+WRITE_INTERVAL = 1.0
+
+
+def estimate_cost(model, input_tokens, output_tokens, cached_tokens=0):
+    """Estimate the USD cost of one call from its token usage."""
+    input_price, cached_price, output_price = PRICES.get(model, (0.0, 0.0, 0.0))
+    uncached = max(input_tokens - cached_tokens, 0)
+    return (uncached * input_price + cached_tokens * cached_price + output_tokens * output_price) / 1e6
+
+
+@dataclass
+class CallMetrics:
+    """Timing, token usage and cost of a single summarization call."""
+
+    mode: str
+    model: str
+    cache_hit: bool = False
+    error: bool = False
+    client_setup_seconds: float = 0.0
+    request_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    total_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def record_usage(self, usage):
+        """Copy token counts from a Responses API ``usage`` object and price them."""
+        if usage is None:
+            return
+        self.input_tokens = usage.input_tokens or 0
+        self.output_tokens = usage.output_tokens or 0
+        details = getattr(usage, "input_tokens_details", None)
+        self.cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+        self.cost_usd = estimate_cost(self.model, self.input_tokens, self.output_tokens, self.cached_tokens)
+
+
+class MetricsRegistry:
+    """
+    Process-wide aggregate of ``CallMetrics``.
+
+    Keeps counters, per-phase latency histograms and the most recent calls,
+    and renders them in the Prometheus text exposition format. If
+    ``SUMMARY_METRICS_FILE`` is set, the exposition is written to that file
+    so a node exporter textfile collector can pick it up. The file is
+    rewritten at most once per ``write_interval`` seconds; calls recorded in
+    between are written by a background timer.
+    """
+
+    def __init__(self, recent_size=50, path=None, write_interval=WRITE_INTERVAL):
+        self.path = path or os.environ.get("SUMMARY_METRICS_FILE")
+        self.write_interval = write_interval
+        self.recent = deque(maxlen=recent_size)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._schedule_lock = threading.Lock()
+        self._last_write = None
+        self._write_timer = None
+        self.write_errors = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}
+            self.errors = {}
+            self.retries = 0
+            self.tokens = {"input": 0, "output": 0, "cached": 0}
+            self.cost_usd = 0.0
+            self.histograms = {
+                phase: {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+                for phase in PHASES
+            }
+            self.recent.clear()
+
+    def record(self, metrics):
+        """Add one call to the aggregates."""
+        with self._lock:
+            labels = (metrics.mode, "hit" if metrics.cache_hit else "miss")
+            self.calls[labels] = self.calls.get(labels, 0) + 1
+            if metrics.error:
+                self.errors[metrics.mode] = self.errors.get(metrics.mode, 0) + 1
+            self.tokens["input"] += metrics.input_tokens
+            self.tokens["output"] += metrics.output_tokens
+            self.tokens["cached"] += metrics.cached_tokens
+            self.cost_usd += metrics.cost_usd
+            for phase in PHASES:
+                self._observe(phase, getattr(metrics, f"{phase}_seconds"))
+            self.recent.append(metrics)
+        if self.path:
+            self._schedule_write()
+
+    def _schedule_write(self):
+        """Write the exposition now, or arm a timer if it was written too recently."""
+        with self._schedule_lock:
+            if self._write_timer is not None:
+                return
+            if self._last_write is not None:
+                delay = self._last_write + self.write_interval - time.monotonic()
+                if delay > 0:
+                    self._write_timer = threading.Timer(delay, self.flush)
+                    self._write_timer.daemon = True
+                    self._write_timer.start()
+                    return
+        self.flush()
+
+    def flush(self):
+        """Write the exposition file now, including any calls still waiting for the timer."""
+        if not self.path:
+            return
+        with self._schedule_lock:
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+                self._write_timer = None
+            self._last_write = time.monotonic()
+        # Metrics must never fail the summarization call they describe
+        try:
+            self.write_prometheus(self.path)
+        except OSError:
+            self.write_errors += 1
+
+    def record_retry(self):
+        """Count one retried request."""
+        with self._lock:
+            self.retries += 1
+
+    def _observe(self, phase, seconds):
+        histogram = self.histograms[phase]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                histogram["buckets"][i] += 1
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+
+    def snapshot(self):
+        """Return the aggregates as plain data, e.g. for display."""
+        with self._lock:
+            return {
+                "calls": sum(self.calls.values()),
+                "cache_hits": sum(count for (_, cache), count in self.calls.items() if cache == "hit"),
+                "errors": sum(self.errors.values()),
+                "retries": self.retries,
+                "tokens": dict(self.tokens),
+                "cost_usd": self.cost_usd,
+                "recent": [asdict(m) for m in self.recent],
+            }
+
+    def render_prometheus(self):
+        """Render the aggregates in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP summarizer_calls_total Summarization calls.",
+                "# TYPE summarizer_calls_total counter",
+            ]
+            for (mode, cache), count in sorted(self.calls.items()):
+                lines.append(f'summarizer_calls_total{{mode="{mode}",cache="{cache}"}} {count}')
+
+            lines += [
+                "# HELP summarizer_errors_total Summarization calls that raised.",
+                "# TYPE summarizer_errors_total counter",
+            ]
+            for mode, count in sorted(self.errors.items()):
+                lines.append(f'summarizer_errors_total{{mode="{mode}"}} {count}')
+
+            lines += [
+                "# HELP summarizer_retries_total Requests retried after a transient error.",
+                "# TYPE summarizer_retries_total counter",
+                f"summarizer_retries_total {self.retries}",
+                "# HELP summarizer_tokens_total Tokens billed by the API.",
+                "# TYPE summarizer_tokens_total counter",
+            ]
+            for kind, count in self.tokens.items():
+                lines.append(f'summarizer_tokens_total{{kind="{kind}"}} {count}')
+
+            lines += [
+                "# HELP summarizer_cost_usd_total Estimated API cost in USD.",
+                "# TYPE summarizer_cost_usd_total counter",
+                f"summarizer_cost_usd_total {self.cost_usd:.6f}",
+                "# HELP summarizer_phase_seconds Latency of each phase of a summarization call.",
+                "# TYPE summarizer_phase_seconds histogram",
+            ]
+            for phase, histogram in self.histograms.items():
+                for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+                    lines.append(f'summarizer_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {count}')
+                lines.append(f'summarizer_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {histogram["count"]}')
+                lines.append(f'summarizer_phase_seconds_sum{{phase="{phase}"}} {histogram["sum"]:.6f}')
+                lines.append(f'summarizer_phase_seconds_count{{phase="{phase}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Atomically write the exposition to ``path``."""
+        directory, name = os.path.split(os.path.abspath(path))
+        with self._write_lock:
+            # A unique temp file in the same directory, so concurrent writers never share one
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(self.render_prometheus())
+                # mkstemp creates the file owner-only; collectors usually run as another user
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+
+_registry = MetricsRegistry()
+# Calls recorded within the last write interval would otherwise never reach the file
+atexit.register(_registry.flush)
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+@contextmanager
+def track_call(mode, model):
+    """
+    Measure one summarization call and record it in the registry.
+
+    Yields a ``CallMetrics`` for the caller to fill in phase timings and
+    usage; total time and errors are filled in here.
+    """
+    metrics = CallMetrics(mode=mode, model=model)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    except Exception:
+        metrics.error = True
+        raise
+    finally:
+        metrics.total_seconds = time.perf_counter() - start
+        _registry.record(metrics)
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """
+    Serve ``/metrics`` from the registry on a background thread.
+
+    Calling this again is a no-op, so it is safe from code that reruns
+    (such as a Streamlit script).
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = _registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
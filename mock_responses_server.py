@@ -0,0 +1,232 @@
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tokens import count_tokens
+
+# Input tokens summarized into each synthetic step
+TOKENS_PER_STEP = 300
+MAX_STEPS = 20
+
+# Characters per streamed text delta
+STREAM_CHUNK_CHARS = 16
+
+
+def _synthetic_summary(input_tokens):
+    """Build a summary JSON document whose size grows with the input."""
+    step_count = max(1, min(MAX_STEPS, input_tokens // TOKENS_PER_STEP))
+    steps = [
+        {
+            "discussion_step": f"Discussion Point {i}",
+            "description": f"The team discussed item {i} of the incident and agreed on the next action to take. "
+                           "Progress was reported back to the incident commander.",
+        }
+        for i in range(1, step_count + 1)
+    ]
+    return json.dumps({
+        "steps": steps,
+        "currently_discussed": "The team is currently verifying whether the latest change resolved the incident.",
+    }, indent=2)
+
+
+class MockResponsesServer:
+    """
+    Local stand-in for the OpenAI Responses endpoint.
+
+    Serves ``POST /v1/responses`` (plain and streaming) with a synthetic
+    summary whose size grows with the input. Each request waits ``latency``
+    seconds before the first output token and then produces output at
+    ``output_tokens_per_second``. A fraction ``error_rate`` of requests fail
+    with a 429 or 500. Aggregate token usage is served at ``GET /stats`` and
+    reset by ``DELETE /stats``.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.2, output_tokens_per_second=100.0,
+                 error_rate=0.0, seed=None):
+        self.latency = latency
+        self.output_tokens_per_second = output_tokens_per_second
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.stats = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"requests": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _record(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                self.stats[name] += value
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    with server._lock:
+                        self._send_json(200, dict(server.stats))
+                else:
+                    self._send_json(404, {"error": {"message": "Not found"}})
+
+            def do_DELETE(self):
+                if self.path.rstrip("/") == "/stats":
+                    server.reset_stats()
+                    self._send_json(200, {})
+                else:
+                    self._send_json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                server._record(requests=1)
+
+                if server.random.random() < server.error_rate:
+                    server._record(errors=1)
+                    status = server.random.choice([429, 500])
+                    self._send_json(status, {"error": {"message": "Injected error", "type": "mock_error"}})
+                    return
+
+                input_text = "".join(
+                    part.get("text", "")
+                    for message in request.get("input", [])
+                    for part in message.get("content", [])
+                )
+                input_tokens = count_tokens(input_text)
+                output_text = _synthetic_summary(input_tokens)
+                output_tokens = count_tokens(output_text)
+                server._record(input_tokens=input_tokens, output_tokens=output_tokens)
+                usage = {
+                    "input_tokens": input_tokens,
+                    "input_tokens_details": {"cached_tokens": 0},
+                    "output_tokens": output_tokens,
+                    "output_tokens_details": {"reasoning_tokens": 0},
+                    "total_tokens": input_tokens + output_tokens,
+                }
+
+                time.sleep(server.latency)
+                if request.get("stream"):
+                    self._stream(output_text, output_tokens, usage, request)
+                else:
+                    time.sleep(output_tokens / server.output_tokens_per_second)
+                    self._send_json(200, _response_object(request, output_text, usage))
+
+            def _stream(self, output_text, output_tokens, usage, request):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def send_event(event):
+                    data = f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8")
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+
+                chunks = [output_text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(output_text), STREAM_CHUNK_CHARS)]
+                delay = output_tokens / server.output_tokens_per_second / max(len(chunks), 1)
+                for sequence, chunk in enumerate(chunks):
+                    time.sleep(delay)
+                    send_event({
+                        "type": "response.output_text.delta",
+                        "item_id": "msg_mock",
+                        "output_index": 0,
+                        "content_index": 0,
+                        "delta": chunk,
+                        "logprobs": [],
+                        "sequence_number": sequence,
+                    })
+                send_event({
+                    "type": "response.completed",
+                    "response": _response_object(request, output_text, usage),
+                    "sequence_number": len(chunks),
+                })
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+
+def _response_object(request, output_text, usage):
+    """Build a Responses API response body."""
+    return {
+        "id": "resp_mock",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": request.get("model", "mock"),
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_mock",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": output_text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": usage,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local mock of the OpenAI Responses endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first output token")
+    parser.add_argument("--output-tps", type=float, default=100.0, help="Output tokens per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 429/500")
+    args = parser.parse_args(argv)
+
+    server = MockResponsesServer(args.host, args.port, args.latency, args.output_tps, args.error_rate)
+    print(f"Serving mock Responses API at {server.base_url}", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
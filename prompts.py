@@ -0,0 +1,68 @@
+# System prompt used for full-transcript summarization
+SYSTEM_PROMPT = """Summarize the current incident call meeting transcript into a structured JSON outlining the step-by-step progression of the discussion. For each step/discussion point, briefly explain what was discussed or solved. Conclude the summary with a clear description of the current topic being discussed on the call (i.e., what participants are focused on right now). Ensure that the output captures the sequence of events and transitions on the call.
+
+Guidelines:
+- Carefully read through the provided meeting transcript.
+- Identify and list stepwise discussions or actions. Each should capture what was discussed, attempted, or resolved up to that point.
+- For each step, write a concise summary (2-3 sentences) explaining what was addressed or achieved.
+- At the end, summarize in 2-3 sentences what is currently being discussed on the call.
+- Persist through the whole transcript, updating your understanding as the incident unfolds.
+- Think step-by-step to ensure that you do not miss any key discussion or resolution transitions.
+
+Output format:
+- Use JSON with two keys:
+  - "steps": a list where each item is an object with:
+     - "discussion_step": a short title for the point or action.
+     - "description": 2-3 sentences summarizing that step.
+  - "currently_discussed": a short paragraph (2-3 sentences) describing the current focus of the meeting.
+
+Example Input:  
+Transcript:  
+We noticed the database latency at 09:12 UTC. Restarted replica instances, no improvement yet.  Let's check recent code deploy logs for errors.  Recent deploy at 09:05 UTC, rollback initiated. Latency improving slightly now. Monitor metrics another 10 minutes to confirm resolution.
+
+Example Output:  
+{
+  "steps": [
+    {
+      "discussion_step": "Initial Issue Detection",
+      "description": "The team identified rising database latency at 09:12 UTC."
+    },
+    {
+      "discussion_step": "Replica Restart Attempt",
+      "description": "Bob restarted the database replica instances, but the latency persisted."
+    },
+    {
+      "discussion_step": "Review of Deploy Logs",
+      "description": "Charlie suggested checking deploy logs for errors, noting a recent code deployment."
+    },
+    {
+      "discussion_step": "Rollback Deploy",
+      "description": "Bob initiated a rollback of the recent code deployment at 09:05 UTC, after which slight latency improvement was reported."
+    }
+  ],
+  "current_discussion": "The team is currently monitoring database metrics for another ten minutes to confirm whether the rollback fully resolves the latency issues."
+}
+
+(Ensure 'current_discussion' always reflects the present focus if the call is ongoing.)
+
+Important: Only output the JSON as specified
+**Objective:** Output a stepwise JSON summary capturing main discussion points, resolution steps, and current meeting focus from a live incident call transcript."""
+
+# System prompt used when folding newly appended transcript into an existing summary
+INCREMENTAL_PROMPT = """You are updating a running JSON summary of a live incident call. You are given the most recent (still open) discussion steps of the summary, the previous description of what was being discussed, and ONLY the part of the transcript spoken since the last update.
+
+Guidelines:
+- Revise the open steps only if the new transcript changes or completes them.
+- Append new steps for any new discussion points, attempted actions, or resolutions in the new transcript.
+- For each step, write a concise summary (2-3 sentences) explaining what was addressed or achieved.
+- Do not repeat steps that are already covered by the open steps.
+- Describe in 2-3 sentences what is currently being discussed on the call.
+
+Output format:
+- Use JSON with two keys:
+  - "steps": the revised open steps followed by any new steps, each an object with:
+     - "discussion_step": a short title for the point or action.
+     - "description": 2-3 sentences summarizing that step.
+  - "currently_discussed": a short paragraph (2-3 sentences) describing the current focus of the meeting.
+
+Important: Only output the JSON as specified"""
@@ -0,0 +1,300 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+import urllib.error
+import urllib.parse
+import urllib.request
+from summary import IncrementalSummarizer
+
+# Quiet period after the last appended segment before a refresh starts
+DEBOUNCE_SECONDS = 2.0
+
+# Upper bound on how long a refresh can be postponed by a steady stream of segments
+MAX_DELAY_SECONDS = 10.0
+
+# Backoff before retrying a failed refresh: doubles per consecutive failure up to the maximum
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 60.0
+
+# Longest a viewer's long-poll request is held open
+MAX_WAIT_SECONDS = 30.0
+
+DEFAULT_PORT = 8765
+
+
+class IncidentSession:
+    """Transcript and shared summary of one incident bridge."""
+
+    def __init__(self, name, api_key=None):
+        self.name = name
+        self.transcript = ""
+        self.transcript_version = 0
+        self.summary = None
+        self.summary_version = 0
+        self.summarized_transcript_version = 0
+        self.updated_at = None
+        self.last_error = None
+        self.failures = 0
+        self.retry_at = None
+        self.summarizer = IncrementalSummarizer(api_key)
+        self.first_pending_at = None
+        self.timer = None
+        self.in_flight = None
+        self.changed = asyncio.Condition()
+
+    def snapshot(self):
+        return {
+            "name": self.name,
+            "summary": self.summary,
+            "summary_version": self.summary_version,
+            "transcript_version": self.transcript_version,
+            "summarized_transcript_version": self.summarized_transcript_version,
+            "updated_at": self.updated_at,
+            "last_error": self.last_error,
+        }
+
+
+class SessionService:
+    """
+    Shared, debounced summarization for named incident sessions.
+
+    Transcript segments are appended to a session and a refresh is scheduled
+    once no new segment has arrived for ``debounce`` seconds (but no later
+    than ``max_delay`` after the first pending segment). At most one
+    summarization runs per session; segments that arrive meanwhile are
+    coalesced into a single follow-up refresh that covers all of them. A
+    failed refresh is retried with exponential backoff. Viewers read the
+    latest shared version, so the number of LLM calls depends on the number
+    of incidents, not on the number of viewers.
+    """
+
+    def __init__(self, api_key=None, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS,
+                 retry_base=RETRY_BASE_SECONDS, retry_max=RETRY_MAX_SECONDS):
+        self.api_key = api_key
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.sessions = {}
+
+    def session(self, name):
+        """Return the named session, creating it on first use (only appends should call this)."""
+        session = self.sessions.get(name)
+        if session is None:
+            session = self.sessions[name] = IncidentSession(name, self.api_key)
+        return session
+
+    def append(self, name, text):
+        """
+        Append a transcript segment to a session and schedule a refresh.
+
+        Args:
+            name (str): Session name
+            text (str): Newly transcribed text
+
+        Returns:
+            int: The session's new transcript version
+        """
+        session = self.session(name)
+        text = text.strip()
+        if not text:
+            return session.transcript_version
+        session.transcript = f"{session.transcript} {text}" if session.transcript else text
+        session.transcript_version += 1
+        self._schedule(session)
+        return session.transcript_version
+
+    def _schedule(self, session):
+        """(Re)arm the debounce timer unless a refresh is already running."""
+        # A running refresh picks up pending segments when it finishes
+        if session.in_flight is not None:
+            return
+        now = time.monotonic()
+        if session.first_pending_at is None:
+            session.first_pending_at = now
+        delay = min(self.debounce, session.first_pending_at + self.max_delay - now)
+        # After a failure, wait out the backoff even while new segments keep arriving
+        if session.retry_at is not None:
+            delay = max(delay, session.retry_at - now)
+        if session.timer is not None:
+            session.timer.cancel()
+        session.timer = asyncio.get_running_loop().call_later(max(delay, 0), self._start_refresh, session)
+
+    def _start_refresh(self, session):
+        session.timer = None
+        session.first_pending_at = None
+        session.in_flight = asyncio.create_task(self._refresh(session))
+
+    async def _refresh(self, session):
+        """Summarize the session's current transcript and publish the result."""
+        transcript, version = session.transcript, session.transcript_version
+        try:
+            # The incremental summarizer only sends text added since its last checkpoint
+            summary = await asyncio.to_thread(session.summarizer.update, transcript)
+        except Exception as e:
+            session.last_error = str(e)
+            session.failures += 1
+            backoff = min(self.retry_max, self.retry_base * 2 ** (session.failures - 1))
+            session.retry_at = time.monotonic() + backoff
+        else:
+            session.summary = summary
+            session.summary_version += 1
+            session.summarized_transcript_version = version
+            session.updated_at = time.time()
+            session.last_error = None
+            session.failures = 0
+            session.retry_at = None
+        finally:
+            session.in_flight = None
+
+        async with session.changed:
+            session.changed.notify_all()
+
+        # Segments that arrived during the refresh (or a failed one) are coalesced into one more
+        if session.transcript_version != session.summarized_transcript_version:
+            self._schedule(session)
+
+    async def wait_for_update(self, name, after_version, timeout=MAX_WAIT_SECONDS):
+        """
+        Return the session snapshot once its summary is newer than ``after_version``.
+
+        Returns immediately if it already is; otherwise waits up to ``timeout``
+        seconds and returns the current snapshot either way. Returns None for
+        an unknown session; reading never creates one.
+        """
+        session = self.sessions.get(name)
+        if session is None:
+            return None
+        if session.summary_version > after_version:
+            return session.snapshot()
+        try:
+            async with session.changed:
+                await asyncio.wait_for(
+                    session.changed.wait_for(lambda: session.summary_version > after_version),
+                    timeout,
+                )
+        except asyncio.TimeoutError:
+            pass
+        return session.snapshot()
+
+    async def handle_http(self, reader, writer):
+        """Serve one HTTP/1.1 request (see ``SessionClient`` for the endpoints)."""
+        status, payload = 200, {}
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            method, target = request_line[0], request_line[1]
+            url = urllib.parse.urlsplit(target)
+            query = urllib.parse.parse_qs(url.query)
+            parts = [urllib.parse.unquote(p) for p in url.path.strip("/").split("/") if p]
+
+            if method == "GET" and parts == ["sessions"]:
+                payload = {"sessions": sorted(self.sessions)}
+            elif method == "GET" and len(parts) == 2 and parts[0] == "sessions":
+                after = int(query.get("after", ["-1"])[0])
+                wait = min(float(query.get("wait", ["0"])[0]), MAX_WAIT_SECONDS)
+                payload = await self.wait_for_update(parts[1], after, wait)
+                if payload is None:
+                    status, payload = 404, {"error": f"Unknown session: {parts[1]}"}
+            elif method == "POST" and len(parts) == 3 and parts[0] == "sessions" and parts[2] == "segments":
+                version = self.append(parts[1], json.loads(body)["text"])
+                payload = {"transcript_version": version}
+            else:
+                status, payload = 404, {"error": "Not found"}
+        except Exception as e:
+            status, payload = 400, {"error": str(e)}
+
+        data = json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Run the HTTP interface until cancelled."""
+        server = await asyncio.start_server(self.handle_http, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+class SessionClient:
+    """
+    Small HTTP client for a running session service.
+
+    Endpoints:
+        POST /sessions/<name>/segments  {"text": ...}   append a transcript segment
+        GET  /sessions/<name>?after=V&wait=S             latest summary, long-polling up to S
+                                                         seconds for a version newer than V
+                                                         (404 until a segment has been appended)
+        GET  /sessions                                   list session names
+    """
+
+    def __init__(self, base_url=f"http://127.0.0.1:{DEFAULT_PORT}"):
+        self.base_url = base_url.rstrip("/")
+
+    def _request(self, method, path, payload=None, timeout=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=data, method=method, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+
+    def append(self, name, text):
+        """Append a transcript segment; returns the new transcript version."""
+        path = f"/sessions/{urllib.parse.quote(name, safe='')}/segments"
+        return self._request("POST", path, {"text": text}, timeout=10)["transcript_version"]
+
+    def get(self, name, after=-1, wait=0):
+        """
+        Return the session snapshot, waiting up to ``wait`` seconds for a version newer than ``after``.
+
+        Returns None if the session does not exist yet.
+        """
+        path = f"/sessions/{urllib.parse.quote(name, safe='')}?after={after}&wait={wait}"
+        try:
+            return self._request("GET", path, timeout=wait + 10)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+
+    def list(self):
+        return self._request("GET", "/sessions", timeout=10)["sessions"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the shared live-session summarization service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--api-key", help="OpenAI API key (defaults to OPENAI_API_KEY)")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS)
+    parser.add_argument("--max-delay", type=float, default=MAX_DELAY_SECONDS)
+    args = parser.parse_args(argv)
+
+    service = SessionService(args.api_key, args.debounce, args.max_delay)
+    print(f"Session service listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import json
+
+
+class StepStreamParser:
+    """
+    Incremental parser that extracts summary steps from a partial JSON document.
+
+    Text is fed in arbitrary chunks as it streams from the model. Each object
+    inside the top-level ``"steps"`` array is returned as soon as its closing
+    brace arrives, without waiting for the rest of the document. Characters
+    are scanned only once, so total work is linear in the output length.
+    """
+
+    def __init__(self, key="steps"):
+        self.key = key
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._steps_depth = None
+        self._item_start = None
+
+    def feed(self, chunk):
+        """
+        Consume the next chunk of JSON text.
+
+        Args:
+            chunk (str): Newly received text
+
+        Returns:
+            list[dict]: Steps completed by this chunk, in order
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start + 1:i]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                if char == "[" and self._depth == 1 and self._last_string == self.key:
+                    self._steps_depth = self._depth + 1
+                elif char == "{" and self._depth == self._steps_depth:
+                    self._item_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if char == "}" and self._depth == self._steps_depth and self._item_start is not None:
+                    completed.append(json.loads(text[self._item_start:i + 1]))
+                    self._item_start = None
+                elif char == "]" and self._steps_depth is not None and self._depth == self._steps_depth - 1:
+                    self._steps_depth = None
+            elif char == "," and self._depth == 1:
+                self._last_string = None
+        self._pos = len(text)
+        return completed
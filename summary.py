@@ -1,33 +1,163 @@
 import os
-from openai import OpenAI
+import time
+import asyncio
+import threading
 import json
+import hashlib
+from collections import OrderedDict
+from prompts import SYSTEM_PROMPT, INCREMENTAL_PROMPT
+from summary_cache import get_cache, make_cache_key, cache_enabled
+from stream_parser import StepStreamParser
+from metrics import track_call
+from compaction import compact_transcript
+from tokens import count_tokens
 
-def summarize_incident_transcript(transcript, api_key=None):
+MODEL = "gpt-4o-mini"
+
+# Output allowance requested per call
+MAX_OUTPUT_TOKENS = 2048
+
+# Number of trailing summary steps the model may still revise during incremental updates
+OPEN_STEPS = 2
+
+
+# Request timeout (seconds) for cached clients; each client keeps its own keep-alive connection pool
+REQUEST_TIMEOUT = 120.0
+
+# Most sync clients kept at once; the app creates one per user-supplied API key
+MAX_CLIENTS = 32
+
+# Process-wide client caches, keyed by API key and retry setting. Async clients are kept per
+# event loop as ``loop -> (clients, closer)`` until that loop shuts down.
+_clients = OrderedDict()
+_async_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _resolve_api_key(api_key=None):
+    """Return the given API key or fall back to the environment variable."""
+    return api_key or os.environ["OPENAI_API_KEY"]
+
+
+def _client_options(max_retries=None):
+    """Constructor options for a cached client; ``None`` keeps the SDK's retry default."""
+    options = {"timeout": REQUEST_TIMEOUT}
+    if max_retries is not None:
+        options["max_retries"] = max_retries
+    return options
+
+
+def get_client(api_key=None, max_retries=None):
     """
-    Summarize an incident call meeting transcript into structured JSON.
-    
+    Return a shared OpenAI client for the given API key.
+
+    Clients are created once per key and keep their HTTP connections alive,
+    so repeated summaries reuse the same connection pool instead of paying
+    for a new TCP/TLS handshake each time. Only the ``MAX_CLIENTS`` most
+    recently used clients are kept.
+
     Args:
-        transcript (str): The meeting transcript to summarize
         api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
-        
+        max_retries (int, optional): Retries the SDK makes on its own; defaults to the SDK's setting
+
     Returns:
-        The OpenAI response containing the structured summary
+        OpenAI: The cached client
     """
-    # Use provided API key or fall back to environment variable
-    if api_key:
-        client = OpenAI(api_key=api_key)
-    else:
-        client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-    
-    response = client.responses.create(
-        model="gpt-4o-mini",
+    api_key = _resolve_api_key(api_key)
+    key = (api_key, max_retries)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # Imported lazily so importing this module stays cheap for the Streamlit app
+            from openai import OpenAI
+            client = _clients[key] = OpenAI(api_key=api_key, **_client_options(max_retries))
+            # An evicted client may still be in use on another thread; it closes itself once unreferenced
+            while len(_clients) > MAX_CLIENTS:
+                _clients.popitem(last=False)
+        _clients.move_to_end(key)
+    return client
+
+
+async def _close_at_shutdown(loop):
+    """Keep a loop's clients until the loop finalizes its async generators, then close them."""
+    try:
+        yield
+    finally:
+        with _clients_lock:
+            loop_clients, _ = _async_clients.pop(loop, ({}, None))
+        for client in loop_clients.values():
+            await client.close()
+
+
+async def get_async_client(api_key=None, max_retries=None):
+    """
+    Return a shared AsyncOpenAI client for the given API key and running event loop.
+
+    Async HTTP connections are bound to the loop that opened them, so clients
+    are cached per loop. They are closed, together with their connections,
+    when the loop shuts down its async generators, as ``asyncio.run`` does
+    before closing the loop.
+
+    Args:
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        max_retries (int, optional): Retries the SDK makes on its own; defaults to the SDK's setting
+
+    Returns:
+        AsyncOpenAI: The cached client
+    """
+    api_key = _resolve_api_key(api_key)
+    loop = asyncio.get_running_loop()
+    closer = None
+    with _clients_lock:
+        entry = _async_clients.get(loop)
+        if entry is None:
+            closer = _close_at_shutdown(loop)
+            entry = _async_clients[loop] = ({}, closer)
+        loop_clients = entry[0]
+        client = loop_clients.get((api_key, max_retries))
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=api_key, **_client_options(max_retries))
+            loop_clients[(api_key, max_retries)] = client
+    if closer is not None:
+        # Starting the generator registers it with the loop, which finalizes it on shutdown
+        await closer.__anext__()
+    return client
+
+
+def _use_compaction(compact=None):
+    """Resolve the compaction switch; defaults to off unless SUMMARY_COMPACT=1."""
+    if compact is None:
+        return os.environ.get("SUMMARY_COMPACT", "0") == "1"
+    return compact
+
+
+def _prepare_transcript(transcript, compact=None):
+    """Compact the transcript if enabled by argument or SUMMARY_COMPACT=1."""
+    if not _use_compaction(compact):
+        return transcript
+    return compact_transcript(transcript).text
+
+
+def _cache_get(key):
+    return get_cache().get(key)
+
+
+def _cache_set(key, result):
+    get_cache().set(key, result)
+
+
+def _request_params(system_prompt, user_text):
+    """Build the Responses API request for one summarization call."""
+    return dict(
+        model=MODEL,
         input=[
             {
                 "role": "system",
                 "content": [
                     {
                         "type": "input_text",
-                        "text": "Summarize the current incident call meeting transcript into a structured JSON outlining the step-by-step progression of the discussion. For each step/discussion point, briefly explain what was discussed or solved. Conclude the summary with a clear description of the current topic being discussed on the call (i.e., what participants are focused on right now). Ensure that the output captures the sequence of events and transitions on the call.\n\nGuidelines:\n- Carefully read through the provided meeting transcript.\n- Identify and list stepwise discussions or actions. Each should capture what was discussed, attempted, or resolved up to that point.\n- For each step, write a concise summary (2-3 sentences) explaining what was addressed or achieved.\n- At the end, summarize in 2-3 sentences what is currently being discussed on the call.\n- Persist through the whole transcript, updating your understanding as the incident unfolds.\n- Think step-by-step to ensure that you do not miss any key discussion or resolution transitions.\n\nOutput format:\n- Use JSON with two keys:\n  - \"steps\": a list where each item is an object with:\n     - \"discussion_step\": a short title for the point or action.\n     - \"description\": 2-3 sentences summarizing that step.\n  - \"currently_discussed\": a short paragraph (2-3 sentences) describing the current focus of the meeting.\n\nExample Input:  \nTranscript:  \nWe noticed the database latency at 09:12 UTC. Restarted replica instances, no improvement yet.  Let's check recent code deploy logs for errors.  Recent deploy at 09:05 UTC, rollback initiated. Latency improving slightly now. Monitor metrics another 10 minutes to confirm resolution.\n\nExample Output:  \n{\n  \"steps\": [\n    {\n      \"discussion_step\": \"Initial Issue Detection\",\n      \"description\": \"The team identified rising database latency at 09:12 UTC.\"\n    },\n    {\n      \"discussion_step\": \"Replica Restart Attempt\",\n      \"description\": \"Bob restarted the database replica instances, but the latency persisted.\"\n    },\n    {\n      \"discussion_step\": \"Review of Deploy Logs\",\n      \"description\": \"Charlie suggested checking deploy logs for errors, noting a recent code deployment.\"\n    },\n    {\n      \"discussion_step\": \"Rollback Deploy\",\n      \"description\": \"Bob initiated a rollback of the recent code deployment at 09:05 UTC, after which slight latency improvement was reported.\"\n    }\n  ],\n  \"current_discussion\": \"The team is currently monitoring database metrics for another ten minutes to confirm whether the rollback fully resolves the latency issues.\"\n}\n\n(Ensure 'current_discussion' always reflects the present focus if the call is ongoing.)\n\nImportant: Only output the JSON as specified\n**Objective:** Output a stepwise JSON summary capturing main discussion points, resolution steps, and current meeting focus from a live incident call transcript."
+                        "text": system_prompt
                     }
                 ]
             },
@@ -36,7 +166,7 @@ def summarize_incident_transcript(transcript, api_key=None):
                 "content": [
                     {
                         "type": "input_text",
-                        "text": transcript
+                        "text": user_text
                     }
                 ]
             },
@@ -49,10 +179,284 @@ def summarize_incident_transcript(transcript, api_key=None):
         reasoning={},
         tools=[],
         temperature=1,
-        max_output_tokens=2048,
+        max_output_tokens=MAX_OUTPUT_TOKENS,
         top_p=1,
         store=True
     )
-    json_response = json.loads(response.output[0].content[0].text)
+
+
+def _request_summary(api_key, system_prompt, user_text, use_cache=None, mode="sync"):
+    """Send one summarization request and return the parsed JSON output."""
+    use_cache = cache_enabled(use_cache)
+    request = _request_params(system_prompt, user_text)
+    with track_call(mode, MODEL) as metrics:
+        if use_cache:
+            key = make_cache_key(request)
+            cached = _cache_get(key)
+            if cached is not None:
+                metrics.cache_hit = True
+                return cached
+
+        start = time.perf_counter()
+        client = get_client(api_key)
+        metrics.client_setup_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = client.responses.create(**request)
+        metrics.request_seconds = time.perf_counter() - start
+        metrics.record_usage(response.usage)
+
+        start = time.perf_counter()
+        result = json.loads(response.output[0].content[0].text)
+        metrics.parse_seconds = time.perf_counter() - start
+
+        if use_cache:
+            _cache_set(key, result)
+        return result
+
+
+async def _arequest_summary(api_key, system_prompt, user_text, use_cache=None, mode="async", max_retries=None,
+                            limiter=None):
+    """
+    Async counterpart of ``_request_summary``.
+
+    ``max_retries`` configures the SDK client. ``limiter`` is charged only when
+    a request is actually sent, for the whole prompt plus the output budget.
+    """
+    use_cache = cache_enabled(use_cache)
+    request = _request_params(system_prompt, user_text)
+    with track_call(mode, MODEL) as metrics:
+        # SQLite reads and commits would stall every other summary on the loop
+        if use_cache:
+            key = make_cache_key(request)
+            cached = await asyncio.to_thread(_cache_get, key)
+            if cached is not None:
+                metrics.cache_hit = True
+                return cached
+
+        if limiter is not None:
+            await limiter.acquire(count_tokens(system_prompt) + count_tokens(user_text) + MAX_OUTPUT_TOKENS)
+
+        start = time.perf_counter()
+        client = await get_async_client(api_key, max_retries)
+        metrics.client_setup_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = await client.responses.create(**request)
+        metrics.request_seconds = time.perf_counter() - start
+        metrics.record_usage(response.usage)
+
+        start = time.perf_counter()
+        result = json.loads(response.output[0].content[0].text)
+        metrics.parse_seconds = time.perf_counter() - start
+
+        if use_cache:
+            await asyncio.to_thread(_cache_set, key, result)
+        return result
+
+
+def summarize_incident_transcript(transcript, api_key=None, use_cache=None, compact=None):
+    """
+    Summarize an incident call meeting transcript into structured JSON.
     
-    return json_response
\ No newline at end of file
+    Args:
+        transcript (str): The meeting transcript to summarize
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        use_cache (bool, optional): Reuse a cached summary of an identical request; defaults to on unless SUMMARY_CACHE=0
+        compact (bool, optional): Compact the transcript first; defaults to off unless SUMMARY_COMPACT=1
+        
+    Returns:
+        The OpenAI response containing the structured summary
+    """
+    transcript = _prepare_transcript(transcript, compact)
+    return _request_summary(api_key, SYSTEM_PROMPT, transcript, use_cache)
+
+
+async def asummarize_incident_transcript(transcript, api_key=None, use_cache=None, compact=None, max_retries=None,
+                                         limiter=None):
+    """
+    Summarize an incident call meeting transcript without blocking the event loop.
+
+    Many summaries can run concurrently from one process; they share a pooled
+    async client per API key.
+
+    Args:
+        transcript (str): The meeting transcript to summarize
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        use_cache (bool, optional): Reuse a cached summary of an identical request; defaults to on unless SUMMARY_CACHE=0
+        compact (bool, optional): Compact the transcript first; defaults to off unless SUMMARY_COMPACT=1
+        max_retries (int, optional): Retries the SDK makes on its own; defaults to the SDK's setting
+        limiter (batch.RateLimiter, optional): Rate limiter charged when a request is sent; cache hits are free
+
+    Returns:
+        dict: The structured summary
+    """
+    if _use_compaction(compact):
+        # Compaction is CPU-bound; run it off the event loop so other summaries keep going
+        transcript = await asyncio.to_thread(_prepare_transcript, transcript, True)
+    return await _arequest_summary(api_key, SYSTEM_PROMPT, transcript, use_cache, max_retries=max_retries,
+                                   limiter=limiter)
+
+
+def stream_incident_summary(transcript, api_key=None, use_cache=None, compact=None):
+    """
+    Summarize an incident call transcript, yielding steps as they are generated.
+
+    The response is streamed and parsed incrementally, so each step is
+    available as soon as the model has finished writing it instead of after
+    the whole JSON document is complete.
+
+    Args:
+        transcript (str): The meeting transcript to summarize
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        use_cache (bool, optional): Reuse a cached summary of an identical request; defaults to on unless SUMMARY_CACHE=0
+        compact (bool, optional): Compact the transcript first; defaults to off unless SUMMARY_COMPACT=1
+
+    Yields:
+        tuple: ("step", step) for each completed step, then ("summary", result)
+        with the full parsed summary
+    """
+    request = _request_params(SYSTEM_PROMPT, _prepare_transcript(transcript, compact))
+    use_cache = cache_enabled(use_cache)
+    with track_call("stream", MODEL) as metrics:
+        if use_cache:
+            key = make_cache_key(request)
+            cached = _cache_get(key)
+            if cached is not None:
+                metrics.cache_hit = True
+                for step in cached.get('steps', []):
+                    yield "step", step
+                yield "summary", cached
+                return
+
+        start = time.perf_counter()
+        client = get_client(api_key)
+        metrics.client_setup_seconds = time.perf_counter() - start
+
+        # Only time spent waiting on the network counts as request time; parsing is measured
+        # separately, and time the consumer spends between steps is not counted at all
+        parser = StepStreamParser()
+        start = time.perf_counter()
+        # The context manager releases the connection even if the caller stops iterating early
+        with client.responses.create(stream=True, **request) as stream:
+            metrics.request_seconds = time.perf_counter() - start
+            events = iter(stream)
+            while True:
+                wait_start = time.perf_counter()
+                event = next(events, None)
+                metrics.request_seconds += time.perf_counter() - wait_start
+                if event is None:
+                    break
+                if event.type == "response.output_text.delta":
+                    parse_start = time.perf_counter()
+                    steps = parser.feed(event.delta)
+                    metrics.parse_seconds += time.perf_counter() - parse_start
+                    for step in steps:
+                        yield "step", step
+                elif event.type == "response.completed":
+                    metrics.record_usage(event.response.usage)
+
+        parse_start = time.perf_counter()
+        result = json.loads(parser.text)
+        metrics.parse_seconds += time.perf_counter() - parse_start
+
+        if use_cache:
+            _cache_set(key, result)
+        yield "summary", result
+
+
+def summarize_incident_transcript_incremental(previous_summary, new_transcript, api_key=None, open_steps=OPEN_STEPS,
+                                              compact=None):
+    """
+    Fold newly appended transcript text into an existing summary.
+
+    Only the last ``open_steps`` steps of the previous summary are sent to the
+    model and may be revised; earlier steps are frozen and copied through
+    unchanged. The request size therefore depends on the length of the new
+    transcript segment, not on the length of the whole call.
+
+    Args:
+        previous_summary (dict): Summary JSON from a previous call, or None to start fresh
+        new_transcript (str): Transcript text spoken since the previous summary was produced
+        api_key (str, optional): OpenAI API key. If not provided, uses environment variable.
+        open_steps (int): Number of trailing steps the model is allowed to revise
+        compact (bool, optional): Compact the new transcript first; defaults to off unless SUMMARY_COMPACT=1
+
+    Returns:
+        dict: The updated summary with "steps" and "currently_discussed", or
+        ``previous_summary`` unchanged if there is no new text
+    """
+    # Nothing new was said; never pay for a request on an empty transcript
+    if not new_transcript.strip():
+        return previous_summary
+    if not previous_summary or not previous_summary.get('steps'):
+        return summarize_incident_transcript(new_transcript, api_key, compact=compact)
+    new_transcript = _prepare_transcript(new_transcript, compact)
+    if not new_transcript.strip():
+        return previous_summary
+
+    steps = previous_summary['steps']
+    split = max(len(steps) - open_steps, 0)
+    frozen, tail = steps[:split], steps[split:]
+    currently_discussed = previous_summary.get(
+        'currently_discussed', previous_summary.get('current_discussion', '')
+    )
+
+    user_text = (
+        "Open steps:\n" + json.dumps(tail, indent=2) +
+        "\n\nPreviously discussed:\n" + currently_discussed +
+        "\n\nNew transcript:\n" + new_transcript
+    )
+
+    update = _request_summary(api_key, INCREMENTAL_PROMPT, user_text, mode="incremental")
+
+    return {
+        'steps': frozen + update.get('steps', []),
+        'currently_discussed': update.get(
+            'currently_discussed', update.get('current_discussion', currently_discussed)
+        ),
+    }
+
+
+def _prefix_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IncrementalSummarizer:
+    """
+    Track a growing transcript and keep its summary up to date.
+
+    Each call to ``update`` sends only the text appended since the last
+    checkpoint, so the cost of a refresh stays flat as the call gets longer.
+    """
+
+    def __init__(self, api_key=None, open_steps=OPEN_STEPS, compact=None):
+        self.api_key = api_key
+        self.open_steps = open_steps
+        self.compact = compact
+        self.summary = None
+        self.checkpoint = 0
+        self.checkpoint_hash = _prefix_hash("")
+
+    def update(self, transcript):
+        """
+        Summarize whatever was appended to ``transcript`` since the last update.
+
+        Args:
+            transcript (str): The full transcript so far
+
+        Returns:
+            dict: The updated summary
+        """
+        # A transcript that no longer extends the summarized text was edited; start over
+        if _prefix_hash(transcript[:self.checkpoint]) != self.checkpoint_hash:
+            self.summary = None
+            self.checkpoint = 0
+
+        new_text = transcript[self.checkpoint:]
+        self.summary = summarize_incident_transcript_incremental(
+            self.summary, new_text, self.api_key, self.open_steps, self.compact
+        )
+        self.checkpoint = len(transcript)
+        self.checkpoint_hash = _prefix_hash(transcript)
+        return self.summary
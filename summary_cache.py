@@ -0,0 +1,196 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Default location of the on-disk cache; override with SUMMARY_CACHE_PATH
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".summary_cache.sqlite3")
+
+# Number of disk-tier access times buffered before they are written back in one transaction
+ACCESS_FLUSH_SIZE = 64
+
+
+def make_cache_key(request):
+    """
+    Build a content-addressed key for a summarization request.
+
+    The key hashes the full request (model, prompts, transcript and sampling
+    parameters), so changing any of them - including the prompt text in
+    ``prompts.py`` - produces a new key and old entries are simply never hit.
+
+    Args:
+        request (dict): The Responses API request parameters
+
+    Returns:
+        str: Hex SHA-256 digest of the request
+    """
+    payload = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_enabled(use_cache=None):
+    """
+    Resolve a ``use_cache`` argument for the summarization functions.
+
+    Args:
+        use_cache (bool, optional): Explicit switch; None defers to the environment
+
+    Returns:
+        bool: ``use_cache`` if given, otherwise True unless SUMMARY_CACHE=0
+    """
+    if use_cache is None:
+        return os.environ.get("SUMMARY_CACHE", "1") != "0"
+    return use_cache
+
+
+class SummaryCache:
+    """
+    Two-tier summary cache: a bounded in-memory LRU in front of SQLite.
+
+    Entries older than ``ttl`` seconds are treated as misses and removed.
+    The disk tier is trimmed to the ``max_disk_entries`` most recently used
+    entries once it grows past that bound. Access times are buffered and
+    written back in batches, so hits never wait on a disk commit. Hit/miss
+    counters are kept per tier in ``stats``.
+    """
+
+    def __init__(self, path=None, max_memory_entries=256, max_disk_entries=10000, ttl=7 * 24 * 3600):
+        self.path = path or os.environ.get("SUMMARY_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._memory = OrderedDict()
+        self._pending_access = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS summaries_created ON summaries (created_at)")
+        self._evict_disk(time.time())
+        self._db.commit()
+
+    def get(self, key):
+        """Return the cached summary for ``key``, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._touch(key, now)
+                    self.stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            row = self._db.execute(
+                "SELECT value, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            value, created_at = json.loads(row[0]), row[1]
+            if now - created_at > self.ttl:
+                self._db.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                self._db.commit()
+                self.stats["misses"] += 1
+                return None
+            self._touch(key, now)
+            self._remember(key, created_at, value)
+            self.stats["disk_hits"] += 1
+            return value
+
+    def set(self, key, value):
+        """Store a summary under ``key`` in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._pending_access.pop(key, None)
+            self._flush_access()
+            # Counts replacements too, so this may trigger a trim early but never late
+            self._disk_count += 1
+            if self._disk_count > self.max_disk_entries:
+                self._evict_disk(now)
+            self._db.commit()
+
+    def flush(self):
+        """Write buffered access times to disk."""
+        with self._lock:
+            self._flush_access()
+            self._db.commit()
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._memory.clear()
+            self._pending_access.clear()
+            self._db.execute("DELETE FROM summaries")
+            self._db.commit()
+            self._disk_count = 0
+
+    def _remember(self, key, created_at, value):
+        """Insert into the memory tier, evicting the least recently used entries."""
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _touch(self, key, now):
+        """Buffer an access time for the disk tier, writing back once enough are pending."""
+        self._pending_access[key] = now
+        if len(self._pending_access) >= ACCESS_FLUSH_SIZE:
+            self._flush_access()
+            self._db.commit()
+
+    def _flush_access(self):
+        if self._pending_access:
+            self._db.executemany(
+                "UPDATE summaries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+
+    def _evict_disk(self, now):
+        """Remove expired entries and trim the disk tier to its size bound."""
+        removed = self._db.execute(
+            "DELETE FROM summaries WHERE created_at < ?", (now - self.ttl,)
+        ).rowcount
+        count = self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        if count > self.max_disk_entries:
+            # Only the least recently used overflow is selected, via the accessed_at index
+            removed += self._db.execute(
+                "DELETE FROM summaries WHERE key IN "
+                "(SELECT key FROM summaries ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_disk_entries,),
+            ).rowcount
+            count = self.max_disk_entries
+        self._disk_count = count
+        self.stats["evictions"] += removed
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide summary cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SummaryCache()
+    return _cache
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import summary  # noqa: E402
+from mock_responses_server import MockResponsesServer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(monkeypatch, tmp_path):
+    """Keep tests away from the shared cache, metrics file and environment switches."""
+    monkeypatch.setenv("SUMMARY_CACHE", "0")
+    monkeypatch.setenv("SUMMARY_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.delenv("SUMMARY_COMPACT", raising=False)
+    monkeypatch.delenv("SUMMARY_METRICS_FILE", raising=False)
+    summary._clients.clear()
+    yield
+    summary._clients.clear()
+
+
+@pytest.fixture
+def mock_server(monkeypatch):
+    """A running mock Responses server the OpenAI SDK is pointed at."""
+    server = MockResponsesServer(latency=0.0, output_tokens_per_second=1e6, seed=0).start()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    yield server
+    server.stop()
@@ -0,0 +1,126 @@
+import json
+import time
+import asyncio
+
+import batch
+from batch import RateLimiter, read_completed, run_batch, truncate_partial_line
+from chunked_summary import asummarize_incident_transcript_chunked
+from example_data import EXAMPLE_TRANSCRIPT
+from prompts import SYSTEM_PROMPT
+from summary import MAX_OUTPUT_TOKENS, asummarize_incident_transcript
+from tokens import count_tokens
+
+
+class RecordingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__(10 ** 6, 10 ** 9)
+        self.charges = []
+
+    async def acquire(self, tokens):
+        self.charges.append(tokens)
+        await super().acquire(tokens)
+
+
+def test_limiter_waits_once_the_bucket_is_empty():
+    async def run():
+        limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=10 ** 9)
+        start = time.monotonic()
+        for _ in range(600):
+            await limiter.acquire(1)
+        burst = time.monotonic() - start
+        start = time.monotonic()
+        await limiter.acquire(1)
+        return burst, time.monotonic() - start
+
+    burst, wait = asyncio.run(run())
+    assert burst < 0.05
+    # 600 requests per minute refill one request every 0.1s
+    assert 0.05 < wait < 0.3
+
+
+def test_limiter_admits_a_request_larger_than_the_bucket():
+    async def run():
+        await asyncio.wait_for(RateLimiter(10 ** 6, 100).acquire(10 ** 6), timeout=1)
+
+    asyncio.run(run())
+
+
+def test_partial_last_line_is_truncated_before_appending(tmp_path):
+    output = tmp_path / "out.jsonl"
+    output.write_text('{"id": "a", "summary": {}}\n{"id": "b", "summ')
+    truncate_partial_line(str(output))
+    assert output.read_text() == '{"id": "a", "summary": {}}\n'
+
+    output.write_text('{"id": "b", "summ')
+    truncate_partial_line(str(output), block_size=4)
+    assert output.read_text() == ""
+
+
+def test_resumed_run_skips_completed_ids_and_survives_a_crash(tmp_path, mock_server):
+    transcripts = tmp_path / "in.jsonl"
+    transcripts.write_text("".join(
+        json.dumps({"id": i, "transcript": f"Call {i}. DB2 Kafka is down."}) + "\n" for i in range(3)
+    ))
+    output = tmp_path / "out.jsonl"
+    output.write_text('{"id": "0", "summary": {"steps": []}}\n{"id": "1", "sum')
+
+    counts = asyncio.run(run_batch(str(transcripts), str(output), concurrency=2))
+
+    assert counts == {"succeeded": 2, "failed": 0, "skipped": 1}
+    assert read_completed(str(output)) == {"0", "1", "2"}
+    assert all(json.loads(line) for line in output.read_text().splitlines())
+
+
+def test_sdk_retries_are_disabled_under_the_retry_loop(tmp_path, mock_server, monkeypatch):
+    monkeypatch.setattr(batch, "backoff_delay", lambda attempt: 0)
+    mock_server.error_rate = 1.0
+    transcripts = tmp_path / "in.jsonl"
+    transcripts.write_text(json.dumps({"id": 1, "transcript": EXAMPLE_TRANSCRIPT}) + "\n")
+    limiter = RecordingLimiter()
+    monkeypatch.setattr(batch, "RateLimiter", lambda *args: limiter)
+
+    counts = asyncio.run(run_batch(str(transcripts), str(tmp_path / "out.jsonl"), max_retries=2))
+
+    assert counts["failed"] == 1
+    # One request per limiter charge: the first attempt and two retries
+    assert mock_server.stats["requests"] == len(limiter.charges) == 3
+
+
+def test_chunked_summaries_charge_the_limiter_per_window(mock_server):
+    limiter = RecordingLimiter()
+
+    async def run():
+        return await asummarize_incident_transcript_chunked(
+            " ".join([EXAMPLE_TRANSCRIPT] * 3), chunk_tokens=3000, limiter=limiter, max_retries=0
+        )
+
+    result = asyncio.run(run())
+    assert result["steps"]
+    assert len(limiter.charges) == mock_server.stats["requests"] > 1
+
+
+def test_limiter_is_charged_for_the_prompt_and_not_for_cache_hits(mock_server):
+    limiter = RecordingLimiter()
+
+    async def run():
+        for _ in range(2):
+            await asummarize_incident_transcript(EXAMPLE_TRANSCRIPT, use_cache=True, limiter=limiter)
+
+    asyncio.run(run())
+    assert mock_server.stats["requests"] == 1
+    assert limiter.charges == [count_tokens(SYSTEM_PROMPT) + count_tokens(EXAMPLE_TRANSCRIPT) + MAX_OUTPUT_TOKENS]
+
+
+def test_on_result_reports_each_record_and_its_latency(tmp_path, mock_server):
+    mock_server.latency = 0.1
+    transcripts = tmp_path / "in.jsonl"
+    transcripts.write_text("".join(
+        json.dumps({"id": i, "transcript": f"Call {i}. DB2 Kafka is down."}) + "\n" for i in range(3)
+    ))
+    results = []
+
+    asyncio.run(run_batch(str(transcripts), str(tmp_path / "out.jsonl"),
+                          on_result=lambda record, seconds: results.append((record["id"], seconds))))
+
+    assert sorted(transcript_id for transcript_id, _ in results) == ["0", "1", "2"]
+    assert all(seconds >= 0.1 for _, seconds in results)
@@ -0,0 +1,57 @@
+from chunked_summary import CHUNK_TOKENS, EXPECTED_OUTPUT_RATIO, chunk_transcript, merge_summaries
+from example_data import EXAMPLE_TRANSCRIPT
+from summary import MAX_OUTPUT_TOKENS
+from tokens import count_tokens
+
+
+def test_default_window_summary_fits_the_output_budget():
+    assert CHUNK_TOKENS * EXPECTED_OUTPUT_RATIO <= MAX_OUTPUT_TOKENS
+    assert CHUNK_TOKENS < 10000
+
+
+def test_transcripts_are_split_only_above_the_window_size():
+    assert len(chunk_transcript(EXAMPLE_TRANSCRIPT)) == 1
+    sentence = "Agent 03 is unreachable again. "
+    below = sentence * (CHUNK_TOKENS // count_tokens(sentence) - 1)
+    above = sentence * (CHUNK_TOKENS // count_tokens(sentence) + 1)
+    assert len(chunk_transcript(below)) == 1
+    assert len(chunk_transcript(above)) == 2
+
+
+def test_windows_respect_the_budget_and_overlap():
+    transcript = " ".join(f"Sentence number {i} is about agent {i}." for i in range(200))
+    chunks = chunk_transcript(transcript, chunk_tokens=120, overlap_tokens=20)
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 120 for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        # The last utterance of each window is repeated at the start of the next
+        last = previous.rsplit(". ", 1)[-1]
+        assert last in current and current.index(last) < len(current) // 2
+    assert chunks[0].startswith("Sentence number 0 ")
+    assert chunks[-1].endswith("agent 199.")
+
+
+def test_windows_keep_line_breaks_and_dotted_values():
+    transcript = "John: Memory is at 1.5 GB.\nJoel: Host 10.0.3.17 runs 2.3.1.\nMatty: Restart it."
+    chunks = chunk_transcript(transcript, chunk_tokens=25, overlap_tokens=0)
+    assert "\n".join(chunks) == transcript
+
+
+def test_merge_drops_steps_repeated_across_the_overlap():
+    partials = [
+        {"steps": [
+            {"discussion_step": "Page Julie", "description": "Rachel paged Julie from the pipeline team."},
+            {"discussion_step": "Escalate to SEV1", "description": "The incident was raised to SEV1 after app crashes."},
+        ], "currently_discussed": "Escalation"},
+        {"steps": [
+            {"discussion_step": "Escalate to SEV1", "description": "The incident was raised to SEV1 after the app crashes."},
+            {"discussion_step": "Restart agents", "description": "Agent 03 was restarted to recover Mesos."},
+        ], "currently_discussed": "Restarting agents"},
+    ]
+    merged = merge_summaries(partials)
+    assert [step["discussion_step"] for step in merged["steps"]] == ["Page Julie", "Escalate to SEV1", "Restart agents"]
+    assert merged["currently_discussed"] == "Restarting agents"
+
+
+def test_merge_of_nothing_is_empty():
+    assert merge_summaries([]) == {"steps": [], "currently_discussed": ""}
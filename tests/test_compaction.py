@@ -0,0 +1,60 @@
+import summary
+from compaction import compact_transcript, split_utterances
+
+
+def test_dotted_values_are_not_split():
+    transcript = ("The heap needs 1.5 GB more. Host db2.kafka.internal at 10.0.3.17 runs version 2.3.1. "
+                  "Restart it!")
+    assert split_utterances(transcript) == [
+        "The heap needs 1.5 GB more.",
+        "Host db2.kafka.internal at 10.0.3.17 runs version 2.3.1.",
+        "Restart it!",
+    ]
+    assert compact_transcript(transcript).text == transcript
+
+
+def test_verbatim_repeats_are_removed():
+    question = "Are there any strong objections to trying a restart of Mesos?"
+    result = compact_transcript(f"{question} I don't think so. {question} Yes, I have one.")
+    assert result.text == f"{question} I don't think so. Yes, I have one."
+    assert result.duplicates_removed == 1
+    assert result.tokens_after < result.tokens_before
+
+
+def test_repeat_with_a_prefix_is_removed():
+    result = compact_transcript("Please post that message to the Slack channel. "
+                                "So please post that message to the Slack channel.")
+    assert result.text == "Please post that message to the Slack channel."
+
+
+def test_short_fragments_are_never_duplicates():
+    transcript = "Which agent is down? Agent 03. Which one is slow? Agent 03."
+    assert compact_transcript(transcript).text == transcript
+
+
+def test_longer_utterance_containing_a_short_one_is_kept():
+    transcript = "Restart agent 03. We should restart agent 03 and then migrate the containers to another region."
+    assert compact_transcript(transcript).text == transcript
+
+
+def test_line_per_turn_transcripts_keep_their_lines():
+    transcript = "John: DB2 Kafka is down.\nMatty: Um, okay.\nMatty: Rachel, page Julie.\n\nRachel: On it."
+    assert compact_transcript(transcript).text == "John: DB2 Kafka is down.\nMatty: okay.\nMatty: Rachel, page Julie.\nRachel: On it."
+
+
+def test_filler_words_and_utterances_are_dropped():
+    result = compact_transcript("Okay. Um, the service is, uh, down. Thanks.")
+    assert result.text == "the service is, down."
+    assert result.fillers_removed == 2
+
+
+def test_compaction_is_off_by_default(monkeypatch):
+    transcript = "Okay. The service is down. The service is down."
+    assert summary._prepare_transcript(transcript) == transcript
+    monkeypatch.setenv("SUMMARY_COMPACT", "1")
+    assert summary._prepare_transcript(transcript) == "The service is down."
+
+
+def test_short_answer_is_not_a_repeat_of_a_longer_sentence():
+    transcript = "I don't know what's going on yet. What does exit code 137 mean? I don't know."
+    assert compact_transcript(transcript).text == transcript
@@ -0,0 +1,89 @@
+import io
+
+import numpy as np
+import pytest
+
+import ingest
+from ingest import SAMPLE_RATE, EnergyVAD, LiveTranscript, StubTranscriber, Transcriber, read_frames
+
+
+def tone(seconds, amplitude=8000):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+
+def noise(seconds, amplitude, rng):
+    return rng.normal(0, amplitude, int(seconds * SAMPLE_RATE)).astype(np.int16)
+
+
+def segments(signal):
+    vad = EnergyVAD()
+    found = []
+    for frame in read_frames(io.BytesIO(signal.tobytes()), vad.frame_samples):
+        segment = vad.process(frame)
+        if segment is not None:
+            found.append((segment[0], len(segment[1]) / SAMPLE_RATE))
+    segment = vad.flush()
+    if segment is not None:
+        found.append((segment[0], len(segment[1]) / SAMPLE_RATE))
+    return found
+
+
+def test_recording_that_starts_mid_speech_is_detected():
+    rng = np.random.default_rng(0)
+    signal = np.concatenate([
+        tone(2) + noise(2, 30, rng), noise(1, 30, rng),
+        tone(2) + noise(2, 30, rng), noise(1, 30, rng),
+    ])
+    found = segments(signal)
+    assert len(found) == 2
+    assert found[0][0] == 0.0 and found[0][1] == pytest.approx(2.0, abs=0.1)
+    assert found[1][0] == pytest.approx(3.0, abs=0.2)
+
+
+def test_noise_floor_adapts_to_a_noisy_background():
+    rng = np.random.default_rng(0)
+    signal = np.concatenate([noise(6, 300, rng), tone(2) + noise(2, 300, rng), noise(2, 300, rng)])
+    found = segments(signal)
+    # The speech after the background was learned is still found as its own segment
+    assert found[-1][0] == pytest.approx(6.0, abs=0.3)
+    assert found[-1][1] == pytest.approx(2.0, abs=0.3)
+
+
+def test_read_frames_zero_pads_the_last_frame():
+    frames = [frame.copy() for frame in read_frames(io.BytesIO(np.arange(5, dtype=np.int16).tobytes()), 4)]
+    assert [list(frame) for frame in frames] == [[0, 1, 2, 3], [4, 0, 0, 0]]
+
+
+def test_transcriber_is_abstract():
+    with pytest.raises(TypeError):
+        Transcriber()
+    transcript = LiveTranscript()
+    transcript.append(StubTranscriber().transcribe(np.zeros(SAMPLE_RATE, dtype=np.int16), SAMPLE_RATE))
+    transcript.append("  ")
+    assert transcript.text == "[speech 1.0s]"
+
+
+def test_segments_are_appended_to_the_session(monkeypatch, capsys):
+    appended = []
+
+    class FakeClient:
+        def __init__(self, base_url):
+            self.base_url = base_url
+
+        def append(self, name, text):
+            if text == "unreachable":
+                raise ConnectionRefusedError("connection refused")
+            appended.append((self.base_url, name, text))
+
+    def fake_ingest(source, transcriber, follow=False, on_segment=None):
+        for start, text in ((0.0, "DB2 Kafka is down."), (2.0, " "), (4.0, "unreachable"), (6.0, "Paging Julie.")):
+            on_segment(start, text)
+
+    monkeypatch.setattr(ingest, "SessionClient", FakeClient)
+    monkeypatch.setattr(ingest, "ingest", fake_ingest)
+    assert ingest.main(["call.wav", "--session", "inc-1", "--service-url", "http://sessions:8765"]) == 0
+
+    assert appended == [("http://sessions:8765", "inc-1", "DB2 Kafka is down."),
+                        ("http://sessions:8765", "inc-1", "Paging Julie.")]
+    assert "Could not append to session inc-1" in capsys.readouterr().err
@@ -0,0 +1,65 @@
+import os
+import time
+import threading
+
+import pytest
+
+from metrics import CallMetrics, MetricsRegistry, estimate_cost
+
+
+def test_concurrent_records_write_a_complete_file(tmp_path):
+    path = tmp_path / "summarizer.prom"
+    registry = MetricsRegistry(path=str(path))
+
+    def record():
+        for _ in range(100):
+            registry.record(CallMetrics(mode="async", model="gpt-4o-mini"))
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.flush()
+
+    assert registry.write_errors == 0
+    assert os.listdir(tmp_path) == ["summarizer.prom"]
+    assert 'summarizer_calls_total{mode="async",cache="miss"} 800' in path.read_text()
+
+
+def test_exposition_errors_do_not_escape_record(tmp_path):
+    registry = MetricsRegistry(path=str(tmp_path / "missing" / "summarizer.prom"))
+    registry.record(CallMetrics(mode="sync", model="gpt-4o-mini"))
+    assert registry.write_errors == 1
+    assert registry.snapshot()["calls"] == 1
+
+
+def test_exposition_file_is_rewritten_at_most_once_per_interval(tmp_path, monkeypatch):
+    path = tmp_path / "summarizer.prom"
+    registry = MetricsRegistry(path=str(path), write_interval=60)
+    writes = []
+    write = registry.write_prometheus
+    monkeypatch.setattr(registry, "write_prometheus", lambda target: (writes.append(target), write(target)))
+
+    for _ in range(10):
+        registry.record(CallMetrics(mode="sync", model="gpt-4o-mini"))
+    assert len(writes) == 1
+    assert 'summarizer_calls_total{mode="sync",cache="miss"} 1' in path.read_text()
+
+    registry.flush()
+    assert len(writes) == 2
+    assert 'summarizer_calls_total{mode="sync",cache="miss"} 10' in path.read_text()
+
+
+def test_pending_calls_are_written_by_the_timer(tmp_path):
+    path = tmp_path / "summarizer.prom"
+    registry = MetricsRegistry(path=str(path), write_interval=0.1)
+    for _ in range(3):
+        registry.record(CallMetrics(mode="sync", model="gpt-4o-mini"))
+    time.sleep(0.3)
+    assert 'summarizer_calls_total{mode="sync",cache="miss"} 3' in path.read_text()
+
+
+def test_cost_uses_the_cached_input_price():
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 0) == 0.15
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 1_000_000, cached_tokens=1_000_000) == pytest.approx(0.675)
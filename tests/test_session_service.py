@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+from session_service import SessionClient, SessionService
+
+
+class FakeSummarizer:
+    """Stands in for IncrementalSummarizer and records every refresh."""
+
+    def __init__(self, delay=0.0, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def update(self, transcript):
+        self.calls.append(transcript)
+        self.release.wait()
+        if len(self.calls) <= self.failures:
+            raise RuntimeError("upstream unavailable")
+        return {"steps": [{"discussion_step": transcript}], "currently_discussed": ""}
+
+
+def make_service(summarizer, **kwargs):
+    service = SessionService(debounce=0.05, max_delay=0.5, retry_base=0.1, retry_max=1.0, **kwargs)
+    original = service.session
+
+    def session(name):
+        created = name not in service.sessions
+        session = original(name)
+        if created:
+            session.summarizer = summarizer
+        return session
+
+    service.session = session
+    return service
+
+
+def test_segments_within_the_debounce_are_summarized_once():
+    summarizer = FakeSummarizer()
+
+    async def run():
+        service = make_service(summarizer)
+        for text in ("DB2 Kafka is down.", "Rolling back.", "Paging Julie."):
+            service.append("inc-1", text)
+        return await service.wait_for_update("inc-1", 0, timeout=2)
+
+    snapshot = asyncio.run(run())
+    assert summarizer.calls == ["DB2 Kafka is down. Rolling back. Paging Julie."]
+    assert snapshot["summary_version"] == 1
+    assert snapshot["summarized_transcript_version"] == 3
+
+
+def test_segments_during_a_refresh_are_coalesced_into_one_follow_up():
+    summarizer = FakeSummarizer()
+    summarizer.release.clear()
+
+    async def run():
+        service = make_service(summarizer)
+        service.append("inc-1", "first")
+        while not summarizer.calls:
+            await asyncio.sleep(0.01)
+        service.append("inc-1", "second")
+        service.append("inc-1", "third")
+        summarizer.release.set()
+        return await service.wait_for_update("inc-1", 1, timeout=2)
+
+    snapshot = asyncio.run(run())
+    assert summarizer.calls == ["first", "first second third"]
+    assert snapshot["summary_version"] == 2
+
+
+def test_failed_refresh_is_retried_with_backoff():
+    summarizer = FakeSummarizer(failures=2)
+
+    async def run():
+        service = make_service(summarizer)
+        service.append("inc-1", "DB2 Kafka is down.")
+        snapshot = await service.wait_for_update("inc-1", 0, timeout=3)
+        return snapshot, service.sessions["inc-1"]
+
+    snapshot, session = asyncio.run(run())
+    assert len(summarizer.calls) == 3
+    assert snapshot["summary_version"] == 1
+    assert snapshot["last_error"] is None
+    assert session.failures == 0
+
+
+def test_reads_do_not_create_sessions():
+    async def run():
+        service = make_service(FakeSummarizer())
+        assert await service.wait_for_update("missing", -1, timeout=0) is None
+
+        server = await asyncio.start_server(service.handle_http, "127.0.0.1", 0)
+        client = SessionClient(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+        try:
+            missing = await asyncio.to_thread(client.get, "missing")
+            names = await asyncio.to_thread(client.list)
+        finally:
+            server.close()
+        return missing, names, service.sessions
+
+    missing, names, sessions = asyncio.run(run())
+    assert missing is None
+    assert names == []
+    assert sessions == {}
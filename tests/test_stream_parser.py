@@ -0,0 +1,40 @@
+import json
+
+from stream_parser import StepStreamParser
+
+DOCUMENT = json.dumps({
+    "steps": [
+        {"discussion_step": "Page Julie", "description": "Rachel paged the {pipeline} team."},
+        {"discussion_step": "Escalate", "description": "Quoted \"SEV1\", with [brackets] and a \\ backslash."},
+    ],
+    "currently_discussed": "Memory limits",
+}, indent=2)
+
+
+def test_steps_are_returned_as_soon_as_they_close():
+    parser = StepStreamParser()
+    first_close = DOCUMENT.index("},") + 1
+    seen = []
+    for i, char in enumerate(DOCUMENT):
+        seen.extend(parser.feed(char))
+        if i == first_close - 2:
+            assert seen == []
+        if i == first_close - 1:
+            assert [step["discussion_step"] for step in seen] == ["Page Julie"]
+    assert seen == json.loads(DOCUMENT)["steps"]
+    assert parser.text == DOCUMENT
+
+
+def test_chunking_does_not_change_the_result():
+    for size in (1, 7, 64, len(DOCUMENT)):
+        parser = StepStreamParser()
+        steps = []
+        for start in range(0, len(DOCUMENT), size):
+            steps.extend(parser.feed(DOCUMENT[start:start + size]))
+        assert steps == json.loads(DOCUMENT)["steps"]
+
+
+def test_objects_outside_the_steps_array_are_ignored():
+    parser = StepStreamParser()
+    text = json.dumps({"meta": {"steps": 1}, "other": [{"a": 1}], "steps": [{"b": 2}]})
+    assert parser.feed(text) == [{"b": 2}]
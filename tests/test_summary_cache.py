@@ -0,0 +1,60 @@
+import itertools
+
+import pytest
+
+import summary_cache
+from summary_cache import SummaryCache, make_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Deterministic time.time so access order is never a tie."""
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(summary_cache.time, "time", lambda: float(next(ticks)))
+
+
+def disk_keys(cache):
+    return {row[0] for row in cache._db.execute("SELECT key FROM summaries")}
+
+
+def test_key_changes_with_any_request_field():
+    request = {"model": "gpt-4o-mini", "input": "transcript", "temperature": 1}
+    assert make_cache_key(request) == make_cache_key(dict(reversed(list(request.items()))))
+    assert make_cache_key(request) != make_cache_key({**request, "temperature": 0})
+
+
+def test_disk_tier_is_bounded_and_keeps_recently_used_entries(tmp_path, clock):
+    cache = SummaryCache(str(tmp_path / "cache.sqlite3"), max_memory_entries=1, max_disk_entries=3)
+    for key in "abc":
+        cache.set(key, {"key": key})
+    # A disk hit on "a" makes "b" the least recently used entry
+    assert cache.get("a") == {"key": "a"}
+    cache.set("d", {"key": "d"})
+
+    assert disk_keys(cache) == {"a", "c", "d"}
+    assert cache.stats["disk_hits"] == 1
+
+
+def test_access_times_are_buffered_until_flushed(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SummaryCache(path, max_memory_entries=1)
+    cache.set("a", {"key": "a"})
+    cache.set("b", {"key": "b"})
+    before = cache._db.execute("SELECT accessed_at FROM summaries WHERE key = 'a'").fetchone()[0]
+
+    assert cache.get("a") == {"key": "a"}
+    reader = SummaryCache(path)
+    assert reader._db.execute("SELECT accessed_at FROM summaries WHERE key = 'a'").fetchone()[0] == before
+
+    cache.flush()
+    assert reader._db.execute("SELECT accessed_at FROM summaries WHERE key = 'a'").fetchone()[0] > before
+
+
+def test_expired_entries_are_misses(tmp_path, clock):
+    cache = SummaryCache(str(tmp_path / "cache.sqlite3"), max_memory_entries=1, ttl=5)
+    cache.set("a", {"key": "a"})
+    for _ in range(10):
+        summary_cache.time.time()
+    assert cache.get("a") is None
+    assert cache.stats["misses"] == 1
+    assert disk_keys(cache) == set()
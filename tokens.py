@@ -0,0 +1,63 @@
+import re
+import sys
+import warnings
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # listed in requirements.txt; counts are estimated without it
+    tiktoken = None
+
+# Encoding used by the gpt-4o model family. tiktoken downloads its BPE file on first use and
+# caches it under TIKTOKEN_CACHE_DIR (default: the system temp dir); run `python tokens.py`
+# once at build time so hosts without network access have it.
+ENCODING_NAME = "o200k_base"
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding, or return None if it is unavailable."""
+    if tiktoken is None:
+        warnings.warn("tiktoken is not installed; token counts are estimated", RuntimeWarning)
+        return None
+    try:
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception as e:
+        # The encoding file could not be loaded (e.g. no network on first use)
+        warnings.warn(f"Could not load the {ENCODING_NAME} encoding ({e}); token counts are estimated",
+                      RuntimeWarning)
+        return None
+
+
+def count_tokens(text):
+    """
+    Count the tokens in ``text`` locally.
+
+    Uses tiktoken when it is installed; otherwise falls back to counting words
+    and punctuation marks, which tracks the BPE count closely for English
+    conversational text.
+
+    Args:
+        text (str): Text to count
+
+    Returns:
+        int: Number of tokens
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_WORD_RE.findall(text))
+
+
+def main():
+    """Download and cache the tokenizer encoding; exits non-zero if it is unavailable."""
+    if _get_encoding() is None:
+        return 1
+    print(f"{ENCODING_NAME} encoding is cached")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())